@@ -0,0 +1,132 @@
+import os
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from quantum_bench.results import KEY_COLUMNS, read_results
+
+# Columns identifying a configuration, i.e. all key columns except the run.
+DIMENSIONS = [c for c in KEY_COLUMNS if c != "run"]
+
+# Statistics of every (configuration, metric) in a summary table.
+SUMMARY_STATISTICS = ["count", "mean", "median", "q25", "q75", "ci_low", "ci_high"]
+
+# Maximum number of resampled values held in memory at once by the bootstrap.
+_BOOTSTRAP_CHUNK = 2_000_000
+
+
+def bootstrap_mean_ci(values: np.ndarray, n_boot: int = 1000, confidence: float = 0.95,
+                      rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """
+    Computes percentile bootstrap confidence intervals of the mean for many samples of equal size at once.
+
+    Args:
+        values: Array of shape (groups, n) with one sample per row.
+        n_boot: Number of bootstrap resamples.
+        confidence: Confidence level of the intervals.
+        rng: Random generator. Defaults to a generator with a fixed seed, so summaries are reproducible.
+
+    Returns:
+        Array of shape (groups, 2) with the lower and upper bound of every row.
+    """
+    rng = rng or np.random.default_rng(0)
+    groups, n = values.shape
+    alpha = (1 - confidence) / 2 * 100
+    bounds = np.empty((groups, 2))
+    chunk = max(1, _BOOTSTRAP_CHUNK // (n_boot * n))
+    for start in range(0, groups, chunk):
+        # The same resampling indices are applied to all rows of the chunk.
+        indices = rng.integers(0, n, size=(n_boot, n))
+        means = values[start:start + chunk][:, indices].mean(axis=2)
+        bounds[start:start + chunk] = np.percentile(means, [alpha, 100 - alpha], axis=1).T
+    return bounds
+
+
+def summarize(df: pd.DataFrame, dims: Optional[List[str]] = None, metrics: Optional[List[str]] = None,
+              n_boot: int = 1000, confidence: float = 0.95, seed: int = 0) -> pd.DataFrame:
+    """
+    Aggregates result rows into one row per (configuration, metric).
+
+    Only successful runs are aggregated. Groups of equal size are bootstrapped together, so the cost is a few
+    vectorized NumPy operations per distinct group size instead of one resampling loop per group.
+
+    Args:
+        df: The result rows.
+        dims: Columns identifying a configuration. Defaults to DIMENSIONS. Rows of all other dimensions are pooled.
+        metrics: Numeric columns to aggregate. Defaults to all numeric columns except the dimensions and the run.
+        n_boot: Number of bootstrap resamples.
+        confidence: Confidence level of the bootstrap CI of the mean.
+        seed: Seed of the bootstrap.
+
+    Returns:
+        DataFrame with the dims, a 'metric' column and the SUMMARY_STATISTICS.
+    """
+    dims = dims or DIMENSIONS
+    if "success" in df.columns:
+        df = df[df["success"] == True]
+    if metrics is None:
+        metrics = [c for c in df.select_dtypes("number").columns if c not in dims and c != "run"]
+
+    long = df.melt(id_vars=dims, value_vars=metrics, var_name="metric", value_name="value").dropna(subset=["value"])
+    long["value"] = long["value"].astype(float)
+    if long.empty:
+        return pd.DataFrame(columns=dims + ["metric"] + SUMMARY_STATISTICS)
+
+    grouped = long.groupby(dims + ["metric"], sort=True, observed=True, dropna=False)["value"]
+    summary = grouped.agg(count="size", mean="mean", median="median")
+    summary["q25"] = grouped.quantile(0.25)
+    summary["q75"] = grouped.quantile(0.75)
+    summary = summary.reset_index()
+
+    rng = np.random.default_rng(seed)
+    group_ids = grouped.ngroup().to_numpy()
+    values = long["value"].to_numpy()
+    order = np.argsort(group_ids, kind="stable")
+    samples = np.split(values[order], np.cumsum(np.bincount(group_ids))[:-1])
+
+    bounds = np.empty((len(samples), 2))
+    sizes = np.array([len(sample) for sample in samples])
+    for size in np.unique(sizes):
+        rows = np.flatnonzero(sizes == size)
+        bounds[rows] = bootstrap_mean_ci(np.stack([samples[i] for i in rows]), n_boot, confidence, rng)
+
+    summary["ci_low"] = bounds[:, 0]
+    summary["ci_high"] = bounds[:, 1]
+    return summary
+
+
+def summary_file_path(results_file: str, dims: Optional[List[str]] = None) -> str:
+    """Returns the path of the summary table of a result file for the given dimensions."""
+    stem = os.path.splitext(results_file.rstrip(os.sep))[0]
+    if not dims or list(dims) == DIMENSIONS:
+        return f"{stem}_summary.csv"
+    return f"{stem}_summary_{'-'.join(dims)}.csv"
+
+
+def load_summary(results_file: str, dims: Optional[List[str]] = None, df: Optional[pd.DataFrame] = None,
+                 **kwargs) -> pd.DataFrame:
+    """
+    Returns the summary table of a result file, computing it only if the stored table is older than the results.
+
+    Args:
+        results_file: Path to the result file (CSV or Parquet).
+        dims: Columns identifying a configuration (see summarize).
+        df: The already loaded results, avoids reading the result file again if the summary is outdated.
+        **kwargs: Further arguments of summarize.
+
+    Returns:
+        The summary table.
+    """
+    # Canonical order, so views over the same dimensions share one summary table.
+    dims = [d for d in DIMENSIONS if d in (dims or DIMENSIONS)] + [d for d in dims or [] if d not in DIMENSIONS]
+    summary_file = summary_file_path(results_file, dims)
+    if os.path.exists(summary_file) and os.path.getmtime(summary_file) >= os.path.getmtime(results_file):
+        return pd.read_csv(summary_file)
+
+    summary = summarize(df if df is not None else read_results(results_file), dims, **kwargs)
+    tmp_file = f"{summary_file}.{os.getpid()}.tmp"
+    summary.to_csv(tmp_file, index=False)
+    os.replace(tmp_file, summary_file)
+    # Read back, so fresh and stored summaries have identical dtypes and values.
+    return pd.read_csv(summary_file)
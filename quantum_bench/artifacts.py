@@ -0,0 +1,141 @@
+import argparse
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+# Default location of the artifact store, shared by all hardware models.
+DEFAULT_STORE_DIR = os.path.join("benchmarks_cache", "circuits")
+
+# Content hashes of input files, keyed by (path, modification time).
+_file_hashes: Dict[tuple, str] = {}
+
+
+def file_hash(path: str) -> str:
+    """Returns the SHA-256 hash of a file's content, computed once per process and file version."""
+    key = (path, os.path.getmtime(path))
+    if key not in _file_hashes:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _file_hashes[key] = digest.hexdigest()
+    return _file_hashes[key]
+
+
+def artifact_key(input_file: str, compiler: str, version: str, options: Dict[str, Any]) -> str:
+    """
+    Returns the hash identifying the output of a compiler run.
+
+    Args:
+        input_file: Path to the input circuit. Its content is hashed, not its path.
+        compiler: Name of the compiler.
+        version: Version of the compiler framework.
+        options: All other inputs of the run, e.g. hardware, optimization level, active phases and seed.
+
+    Returns:
+        The key as hex string.
+    """
+    description = json.dumps([file_hash(input_file), compiler, version, options], sort_keys=True, default=str)
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of compiled circuits.
+
+    Every circuit is stored gzip-compressed under the SHA-256 hash of its content, so identical outputs of
+    different runs are stored only once. An index maps the key of a run (see artifact_key) to the hash of its
+    latest output. All files are written atomically, so parallel workers can share a store.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        """
+        Initializes the store.
+
+        Args:
+            root: Directory of the store.
+        """
+        self.root = root
+
+    def put(self, path: str, key: Optional[str] = None) -> str:
+        """
+        Adds a file to the store.
+
+        Args:
+            path: Path to the file, e.g. an exported QASM file.
+            key: Key of the run that produced the file. Indexed if given.
+
+        Returns:
+            The content hash referencing the stored file.
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+
+        object_path = self._object_path(content_hash)
+        if not os.path.exists(object_path):
+            # mtime=0 keeps the compressed bytes independent of the time of writing.
+            self._write_atomic(object_path, gzip.compress(data, mtime=0))
+        if key is not None:
+            self._write_atomic(self._index_path(key), content_hash.encode())
+        return content_hash
+
+    def get(self, content_hash: str) -> bytes:
+        """Returns the content of a stored file."""
+        with gzip.open(self._object_path(content_hash), "rb") as f:
+            return f.read()
+
+    def extract(self, content_hash: str, path: str) -> str:
+        """Writes a stored file uncompressed to the given path and returns the path."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._write_atomic(path, self.get(content_hash))
+        return path
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Returns the content hash of the latest output stored for a run key, or None."""
+        index_path = self._index_path(key)
+        if not os.path.exists(index_path):
+            return None
+        with open(index_path, "r") as f:
+            return f.read().strip()
+
+    def __contains__(self, content_hash: str) -> bool:
+        return os.path.exists(self._object_path(content_hash))
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self.root, "objects", content_hash[:2], f"{content_hash[2:]}.gz")
+
+    def _index_path(self, key: str) -> str:
+        return os.path.join(self.root, "index", key[:2], key[2:])
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieves a compiled circuit from the artifact store.")
+    parser.add_argument("artifact", help="content hash from the 'artifact' column of a result file")
+    parser.add_argument("output_file", nargs="?", help="file to write the circuit to (default: stdout)")
+    parser.add_argument("--store", default=DEFAULT_STORE_DIR, help=f"store directory (default: {DEFAULT_STORE_DIR})")
+    args = parser.parse_args()
+
+    store = ArtifactStore(args.store)
+    if args.artifact not in store:
+        raise SystemExit(f"Artifact {args.artifact} not found in {args.store}.")
+    if args.output_file:
+        store.extract(args.artifact, args.output_file)
+    else:
+        print(store.get(args.artifact).decode(), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,201 @@
+import hashlib
 import os
+import pickle
+import time
+import tracemalloc
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, Tuple, List
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple, List, Callable
 
+from quantum_bench.artifacts import artifact_key
 from quantum_bench.hardware.model import HardwareModel
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Phases whose durations add up to the compile time.
+COMPILE_PHASES = ["rebase", "mapping", "optimization"]
+
+# All timed phases of a compile, including adapter setup, circuit import and export.
+PHASES = ["setup", "parse"] + COMPILE_PHASES + ["export"]
+
+# Circuit states an adapter can save after a phase and resume from (see CompilerAdapter.run_steps).
+CHECKPOINTS = ["rebase", "layout"]
+
+# A step of a compile: (timed phase, checkpoint reached after the step or None, function transforming the state).
+CompileStep = Tuple[str, Optional[str], Callable[[Any], Any]]
+
+# Writing '5' resets the peak RSS (VmHWM) of the process (Linux >= 4.0).
+_CLEAR_REFS = "/proc/self/clear_refs"
+_STATUS = "/proc/self/status"
+
+# Whether the peak RSS can be reset per phase, None until first tried.
+_peak_resettable: Optional[bool] = None
+
+
+def _status_mb(field: str) -> Optional[float]:
+    try:
+        with open(_STATUS, "r") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def _max_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return max_rss / 1024 ** 2 if os.uname().sysname == "Darwin" else max_rss / 1024
+
+
+def _start_peak_rss() -> Optional[float]:
+    """Resets the peak RSS of the process where possible and returns the baseline of a phase in MB."""
+    global _peak_resettable
+    if _peak_resettable is not False:
+        try:
+            with open(_CLEAR_REFS, "w") as f:
+                f.write("5")
+            _peak_resettable = True
+            return _status_mb("VmRSS")
+        except OSError:
+            _peak_resettable = False
+    return _max_rss_mb()
+
+
+def _peak_rss_delta(baseline: Optional[float]) -> Optional[float]:
+    """
+    Returns how far the RSS rose above the baseline during a phase, in MB.
+
+    Without a resettable peak, only the growth of the lifetime peak (ru_maxrss) is known, which is a lower bound.
+    """
+    peak = _status_mb("VmHWM") if _peak_resettable else _max_rss_mb()
+    if baseline is None or peak is None:
+        return None
+    return max(0.0, peak - baseline)
+
+
+def _start_traced_peak() -> Optional[int]:
+    if not tracemalloc.is_tracing():
+        return None
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    return current
+
+
+def _traced_peak_delta(baseline: Optional[int]) -> Optional[float]:
+    if baseline is None or not tracemalloc.is_tracing():
+        return None
+    return max(0, tracemalloc.get_traced_memory()[1] - baseline) / 1024 ** 2
+
+
+def _dump_pickle(obj: Any, path: str):
+    with open(path, "wb") as f:
+        pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+@dataclass
+class LoadedCircuit:
+    """A parsed input circuit shared by all runs of an adapter on the same QASM file."""
+    qasm_file: str
+    circuit: Any
+    # Framework metrics of the circuit, calculated on first use (see CompilerAdapter.input_metrics).
+    metrics: Optional[Dict[str, Any]] = None
+
+
+class PhaseTimer:
+    """
+    Measures wall-clock (perf_counter) time, process CPU time and peak memory per compiler phase.
+
+    The peak memory of a phase is how far the resident set size (RSS) of the process rose above its level at the
+    start of the phase. If tracemalloc is tracing (e.g. 'python -X tracemalloc'), the peak of the Python-side
+    allocations is recorded as well.
+    """
+
+    def __init__(self):
+        self.wall_times: Dict[str, float] = {}
+        self.cpu_times: Dict[str, float] = {}
+        self.peak_rss: Dict[str, float] = {}
+        self.peak_traced: Dict[str, float] = {}
+
+    def record(self, name: str, wall_time: float, cpu_time: float, peak_rss_mb: Optional[float] = None,
+               peak_traced_mb: Optional[float] = None):
+        """Adds a phase measured elsewhere (e.g. a shared circuit import)."""
+        self.wall_times[name] = self.wall_times.get(name, 0.0) + wall_time
+        self.cpu_times[name] = self.cpu_times.get(name, 0.0) + cpu_time
+        if peak_rss_mb is not None:
+            self.peak_rss[name] = max(self.peak_rss.get(name, 0.0), peak_rss_mb)
+        if peak_traced_mb is not None:
+            self.peak_traced[name] = max(self.peak_traced.get(name, 0.0), peak_traced_mb)
+
+    def measurement(self, name: str) -> Tuple[Optional[float], ...]:
+        """Returns the (wall-clock, CPU, peak RSS, peak traced) measurement of a phase, e.g. to record it elsewhere."""
+        return (self.wall_times.get(name, 0.0), self.cpu_times.get(name, 0.0),
+                self.peak_rss.get(name), self.peak_traced.get(name))
+
+    @contextmanager
+    def phase(self, name: str):
+        """
+        Measures the enclosed block. Repeated phases (e.g. optimization before and after mapping) are summed up,
+        their memory peaks are maximized.
+        """
+        rss_baseline = _start_peak_rss()
+        traced_baseline = _start_traced_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - wall_start, time.process_time() - cpu_start,
+                        _peak_rss_delta(rss_baseline), _traced_peak_delta(traced_baseline))
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Returns the measurements as metrics.
+
+        Each phase yields '<phase>_time', '<phase>_cpu_time' and, where measured, '<phase>_peak_rss_mb' and
+        '<phase>_peak_traced_mb'. Unless a 'compile' phase was timed directly, the 'compile_' metrics are the sums
+        (times) or maxima (memory) over the compile phases.
+        """
+        wall_times = dict(self.wall_times)
+        cpu_times = dict(self.cpu_times)
+        peaks = {"peak_rss_mb": dict(self.peak_rss), "peak_traced_mb": dict(self.peak_traced)}
+        if "compile" not in wall_times:
+            wall_times["compile"] = sum(wall_times.get(p, 0.0) for p in COMPILE_PHASES)
+            cpu_times["compile"] = sum(cpu_times.get(p, 0.0) for p in COMPILE_PHASES)
+            for values in peaks.values():
+                compile_peaks = [values[p] for p in COMPILE_PHASES if p in values]
+                if compile_peaks:
+                    values["compile"] = max(compile_peaks)
+
+        metrics = {}
+        for name in wall_times:
+            metrics[f"{name}_time"] = wall_times[name]
+            metrics[f"{name}_cpu_time"] = cpu_times[name]
+            for kind, values in peaks.items():
+                if name in values:
+                    metrics[f"{name}_{kind}"] = values[name]
+        return metrics
+
 
 class CompilerAdapter(ABC):
     """Abstract base class for all quantum compiler adapters."""
 
+    # Names of the device objects built from the hardware model (see hardware_artifact).
+    hardware_artifacts: List[str] = []
+
+    # File extension of saved checkpoints (see _dump_checkpoint).
+    checkpoint_suffix = ".pkl"
+
+    # Whether the compiled circuit depends on the seed. Compilers without it return the same circuit for every seed.
+    uses_seed = False
+
     def __init__(self, name: str, hardware: HardwareModel, export_dir: Optional[str] = None):
         """
         Initializes the compiler adapter.
@@ -21,21 +209,333 @@ class CompilerAdapter(ABC):
         self.hardware = hardware
         self.export_dir = export_dir or os.path.join("benchmarks_cache", hardware.name)
         os.makedirs(self.export_dir, exist_ok=True)
+        self.artifact_dir = os.path.join(self.export_dir, "artifacts")
+        self._hardware_artifacts: Dict[str, Any] = {}
+        self._setup_timer = PhaseTimer()
+        self._loaded_circuit: Optional[LoadedCircuit] = None
+        self._pipelines: Dict[Tuple, Any] = {}
 
+    @property
     @abstractmethod
-    def compile(self, qasm_file: str, optimization_level: int = 1, active_phases: Optional[List[str]] = None, seed: Optional[int] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    def version(self) -> str:
+        """Version of the compiler framework."""
+        pass
+
+    def prepare(self) -> Tuple[Optional[float], ...]:
+        """
+        Loads all hardware artifacts of the adapter, so they are not built inside a timed phase.
+
+        Returns:
+            The setup measurement not yet reported by a compile (see setup_times).
+        """
+        for name in self.hardware_artifacts:
+            self.hardware_artifact(name)
+        return self.setup_times
+
+    @property
+    def setup_times(self) -> Tuple[Optional[float], ...]:
+        """
+        The (wall-clock, CPU, peak RSS, peak traced) measurement of the setup (hardware artifacts and pipelines)
+        performed since a compile last took it (see take_setup_times).
+        """
+        return self._setup_timer.measurement("setup")
+
+    def take_setup_times(self) -> Tuple[Optional[float], ...]:
+        """
+        Returns the setup measurement (see setup_times) and resets it.
+
+        Every compile records the setup it triggered this way, so a one-time setup is reported by a single row
+        and compiles served entirely from the in-memory caches report zero.
+        """
+        times = self.setup_times
+        self._setup_timer = PhaseTimer()
+        return times
+
+    def hardware_artifact(self, name: str) -> Any:
+        """
+        Returns a device object derived from the hardware model (e.g. a Qiskit Target).
+
+        Artifacts are built once and pickled to the artifact directory, keyed by the hardware fingerprint and the
+        framework version, so later runs and other worker processes only load them.
+
+        Args:
+            name: Name of the artifact.
+
+        Returns:
+            The artifact.
+        """
+        if name not in self._hardware_artifacts:
+            with self._setup_timer.phase("setup"):
+                key = hashlib.sha256(f"{self.hardware.fingerprint()}|{self.name}|{name}|{self.version}".encode()).hexdigest()
+                filename = os.path.join(self.artifact_dir, f"{self.name.lower()}_{name}_{key[:16]}.pkl")
+                artifact = self._read_artifact(filename)
+                if artifact is None:
+                    artifact = self._build_hardware_artifact(name)
+                    self._write_artifact(filename, artifact)
+                self._hardware_artifacts[name] = artifact
+        return self._hardware_artifacts[name]
+
+    def _build_hardware_artifact(self, name: str) -> Any:
+        """Builds the named hardware artifact from the hardware model."""
+        raise ValueError(f"Unknown hardware artifact: {name}")
+
+    @staticmethod
+    def _read_artifact(filename: str) -> Any:
+        if not os.path.exists(filename):
+            return None
+        try:
+            with open(filename, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"Ignoring unreadable hardware artifact {filename}: {e}")
+            return None
+
+    def _write_artifact(self, filename: str, artifact: Any):
+        try:
+            os.makedirs(self.artifact_dir, exist_ok=True)
+            self._write_atomic(filename, lambda path: _dump_pickle(artifact, path))
+        except Exception as e:
+            print(f"Could not cache hardware artifact {filename}: {e}")
+
+    def load_circuit(self, qasm_file: str) -> Tuple[Any, Tuple[Optional[float], ...]]:
+        """
+        Returns a framework-native copy of the circuit in the QASM file.
+
+        The file is parsed only once while consecutive runs use the same input; every call returns a cheap
+        copy of the parsed circuit, so runs never influence each other. Only the call that parsed the file reports
+        the import cost, calls served from the cache report a zero measurement.
+
+        Args:
+            qasm_file: Path to the QASM file.
+
+        Returns:
+            A tuple of the circuit copy and the (wall-clock, CPU, peak RSS, peak traced) measurement of the import
+            (see PhaseTimer.measurement).
+        """
+        if self._loaded_circuit is not None and self._loaded_circuit.qasm_file == qasm_file:
+            return self._copy_circuit(self._loaded_circuit.circuit), (0.0, 0.0, None, None)
+
+        self._loaded_circuit = None
+        timer = PhaseTimer()
+        with timer.phase("parse"):
+            circuit = self._parse_circuit(qasm_file)
+        self._loaded_circuit = LoadedCircuit(qasm_file=qasm_file, circuit=circuit)
+        return self._copy_circuit(circuit), timer.measurement("parse")
+
+    def input_metrics(self) -> Dict[str, Any]:
+        """Returns the framework metrics of the circuit last loaded by load_circuit, calculated once per input."""
+        loaded = self._loaded_circuit
+        if loaded.metrics is None:
+            loaded.metrics = self._calculate_metrics(loaded.circuit)
+        return dict(loaded.metrics)
+
+    def native_metrics(self, circuit: Any) -> Dict[str, Any]:
+        """Returns the framework metrics of a compiled circuit, with those of its input circuit as 'initial'."""
+        metrics = self._calculate_metrics(circuit)
+        metrics["initial"] = self.input_metrics()
+        return metrics
+
+    @abstractmethod
+    def _parse_circuit(self, qasm_file: str) -> Any:
+        """Parses a QASM file into the framework-native circuit type."""
+        pass
+
+    def _copy_circuit(self, circuit: Any) -> Any:
+        """Returns a copy of a parsed circuit that the compile phases may modify."""
+        return circuit.copy()
+
+    @abstractmethod
+    def _calculate_metrics(self, circuit: Any) -> Dict[str, Any]:
+        """Calculates gate count, depth, 2-qubit and SWAP gate count of a framework-native circuit."""
+        pass
+
+    @abstractmethod
+    def compile(self, qasm_file: str, optimization_level: int = 1, active_phases: Optional[List[str]] = None, seed: Optional[int] = None,
+                save_checkpoints: bool = False, resume_from: Optional[str] = None,
+                native_metrics: bool = True) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
         Compiles the given QASM circuit.
 
+        The input is loaded via load_circuit, so its import time is reported as 'parse_time'
+        and is not part of 'compile_time'. The hardware and pipeline setup this compile triggered
+        (see take_setup_times) is reported as 'setup_time'.
+
         Args:
             qasm_file: Path to the QASM file.
             optimization_level: General optimization level (0-3).
             active_phases: List of active phases (e.g., ["rebase", "mapping", "optimization"]).
                            If None, all phases are executed.
             seed: Random seed for reproducibility.
+            save_checkpoints: Whether to save the circuit state at every checkpoint (see run_steps).
+            resume_from: Checkpoint to start from instead of the input circuit (one of CHECKPOINTS).
+            native_metrics: Whether to calculate the circuit metrics with the framework (see native_metrics).
+                            Callers that compute them from the exported QASM file skip this.
 
         Returns:
             A tuple containing a dictionary with metrics and the path to the compiled QASM file.
+            The metrics include the wall-clock and CPU times of every executed phase (see PhaseTimer).
             Returns (None, None) if compilation fails.
         """
         pass
+
+    def compile_many(self, qasm_files: List[str], optimization_level: int = 1,
+                     active_phases: Optional[List[str]] = None, seed: Optional[int] = None,
+                     num_processes: Optional[int] = None,
+                     native_metrics: bool = True) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Compiles many circuits with the same settings through one pass pipeline (see pipeline).
+
+        By default the circuits are compiled one after another. Adapters whose framework can run a pipeline on
+        many circuits at once override this.
+
+        Args:
+            qasm_files: Paths to the QASM files.
+            optimization_level: General optimization level (0-3).
+            active_phases: List of active phases. If None, all phases are executed.
+            seed: Random seed for reproducibility.
+            num_processes: Number of processes used by native batching. None leaves the choice to the framework.
+            native_metrics: Whether to calculate the circuit metrics with the framework.
+
+        Returns:
+            One (metrics, compiled QASM path) tuple per file, as returned by compile.
+        """
+        return [self.compile(qasm_file, optimization_level, active_phases, seed, native_metrics=native_metrics)
+                for qasm_file in qasm_files]
+
+    def run_steps(self, state: Any, steps: List[CompileStep], timer: PhaseTimer, qasm_file: str,
+                  options: Dict[str, Any], save_checkpoints: bool = False, resume_from: Optional[str] = None) -> Any:
+        """
+        Runs the steps of a compile on a circuit state, timing every step as its phase.
+
+        The state reached after a step with a checkpoint can be saved, and later compiles can start from it
+        (resume_from) instead of repeating the steps up to it. If the checkpoint is not saved yet, these steps are
+        executed once without being timed and the checkpoint is saved. Either way, only the phases after the
+        checkpoint are timed.
+
+        Args:
+            state: The parsed input circuit.
+            steps: The steps in execution order.
+            timer: Timer of the compile.
+            qasm_file: Path to the input QASM file, identifies the checkpoints together with the options.
+            options: All other settings the states depend on, e.g. phases, optimization level and seed.
+            save_checkpoints: Whether to save the state at every checkpoint.
+            resume_from: Checkpoint to start from.
+
+        Returns:
+            The final state.
+        """
+        start = 0
+        if resume_from is not None:
+            checkpoints = [checkpoint for _, checkpoint, _ in steps]
+            if resume_from not in checkpoints:
+                raise ValueError(f"{self.name} has no checkpoint '{resume_from}' for the phases {options.get('active_phases')}.")
+            start = checkpoints.index(resume_from) + 1
+            saved = self.load_checkpoint(resume_from, qasm_file, options)
+            if saved is None:
+                for _, _, step in steps[:start]:
+                    state = step(state)
+                self.save_checkpoint(resume_from, qasm_file, options, state)
+            else:
+                state = saved
+
+        for phase, checkpoint, step in steps[start:]:
+            with timer.phase(phase):
+                state = step(state)
+            if checkpoint is not None and save_checkpoints:
+                self.save_checkpoint(checkpoint, qasm_file, options, state)
+        return state
+
+    def checkpoint_path(self, name: str, qasm_file: str, options: Dict[str, Any]) -> str:
+        """
+        Returns the path of a checkpoint, keyed by the input circuit's content, the hardware and the options
+        the checkpoint depends on (see _checkpoint_options).
+        """
+        key = artifact_key(qasm_file, self.name, self.version,
+                           {"hardware": self.hardware.fingerprint(), "checkpoint": name,
+                            **self._checkpoint_options(name, options)})
+        return os.path.join(self.export_dir, "checkpoints", f"{self.name.lower()}_{name}_{key[:16]}{self.checkpoint_suffix}")
+
+    def _checkpoint_options(self, name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Returns the options the state at a checkpoint depends on, all of them by default.
+
+        Adapters drop options only used after the checkpoint (e.g. the seed of a later mapping), so compiles that
+        differ only in those share the checkpoint.
+        """
+        return options
+
+    def load_checkpoint(self, name: str, qasm_file: str, options: Dict[str, Any]) -> Any:
+        """Returns a saved checkpoint state, or None if it is not saved or unreadable."""
+        filename = self.checkpoint_path(name, qasm_file, options)
+        if not os.path.exists(filename):
+            return None
+        try:
+            return self._load_checkpoint(filename)
+        except Exception as e:
+            print(f"Ignoring unreadable checkpoint {filename}: {e}")
+            return None
+
+    def save_checkpoint(self, name: str, qasm_file: str, options: Dict[str, Any], state: Any):
+        """Saves a checkpoint state."""
+        filename = self.checkpoint_path(name, qasm_file, options)
+        try:
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            self._write_atomic(filename, lambda path: self._dump_checkpoint(state, path))
+        except Exception as e:
+            print(f"Could not save checkpoint {filename}: {e}")
+
+    def _dump_checkpoint(self, state: Any, path: str):
+        """Writes a checkpoint state, pickled by default."""
+        _dump_pickle(state, path)
+
+    def _load_checkpoint(self, path: str) -> Any:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def pipeline(self, active_phases: Optional[List[str]], optimization_level: int, seed: Optional[int] = None) -> Any:
+        """
+        Returns the framework-native pass pipeline for the given settings, building it once per adapter.
+
+        Building the passes is timed as part of the adapter setup (see setup_times), so it is not counted
+        in the compile time of the first circuit.
+
+        Args:
+            active_phases: List of active phases, None for the framework's default pipeline.
+            optimization_level: General optimization level (0-3).
+            seed: Random seed of the passes.
+
+        Returns:
+            The pipeline as built by _build_pipeline.
+        """
+        key = (tuple(active_phases) if active_phases is not None else None, optimization_level, seed)
+        if key not in self._pipelines:
+            self.prepare()
+            with self._setup_timer.phase("setup"):
+                self._pipelines[key] = self._build_pipeline(active_phases, optimization_level, seed)
+        return self._pipelines[key]
+
+    def _build_pipeline(self, active_phases: Optional[List[str]], optimization_level: int, seed: Optional[int]) -> Any:
+        """Builds the reusable passes of a pipeline. Adapters without reusable passes keep the default None."""
+        return None
+
+    def _export_path(self, original_file: str, opt_level: int) -> str:
+        """
+        Returns the path to export a compiled circuit to.
+
+        The name contains the process id, so parallel workers never overwrite each other's exports. Exports are
+        transient: the executor moves every compiled circuit into the artifact store (see quantum_bench.artifacts).
+        """
+        _, file = os.path.split(original_file.removesuffix(".qasm"))
+        return os.path.join(self.export_dir, f"{file}_{self.name.lower()}_opt{opt_level}_{os.getpid()}.qasm")
+
+    def _write_atomic(self, filename: str, dump: Callable[[str], None]):
+        """
+        Writes a file via a temporary path and moves it into place, so parallel workers never read partial files.
+
+        Args:
+            filename: Final path of the file.
+            dump: Function writing the file content to the given path.
+        """
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        dump(tmp_filename)
+        os.replace(tmp_filename, filename)
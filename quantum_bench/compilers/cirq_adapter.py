@@ -1,5 +1,4 @@
-import os
-import time
+import re
 from typing import Optional, Tuple, Dict, Any, List
 
 import cirq
@@ -7,7 +6,9 @@ import networkx as nx
 from cirq.contrib.qasm_import import circuit_from_qasm
 
 from quantum_bench.hardware.model import HardwareModel
-from .base import CompilerAdapter
+from .base import CompilerAdapter, PhaseTimer
+
+BARRIER_PATTERN = re.compile(r"^[ \t]*barrier\b.*$", re.MULTILINE)
 
 
 class GenericDevice(cirq.Device):
@@ -64,61 +65,81 @@ class GenericDevice(cirq.Device):
 class CirqAdapter(CompilerAdapter):
     """Adapter for the Cirq compiler."""
 
+    hardware_artifacts = ["device"]
+
     def __init__(self, hardware: HardwareModel, export_dir: str = None):
         super().__init__("Cirq", hardware, export_dir)
-        self.device = GenericDevice(hardware)
-        self.device_graph = self.device.metadata.nx_graph
-        self.target_gateset = self.device.gateset
 
-    def compile(self, qasm_file: str, optimization_level: int = 1, active_phases: Optional[List[str]] = None, seed: Optional[int] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
-        try:
-            with open(qasm_file, 'r') as f:
-                qasm_str = f.read()
-            
-            # Remove barriers as they might cause issues in import
-            qasm_str = "\n".join(line for line in qasm_str.splitlines() if not line.strip().startswith("barrier"))
-            optimized_circuit = circuit_from_qasm(qasm_str)
-        except Exception as e:
-            print(f"Cirq QASM Import Error: {e}")
-            return None, None
+    @property
+    def version(self) -> str:
+        return cirq.__version__
 
-        initial_metrics = self._calculate_metrics(optimized_circuit)
-        initial_metrics["compile_time"] = '-'
+    @property
+    def device(self) -> GenericDevice:
+        return self.hardware_artifact("device")
 
-        start_time = time.time()
+    @property
+    def device_graph(self) -> nx.Graph:
+        return self.device.metadata.nx_graph
 
+    @property
+    def target_gateset(self) -> cirq.Gateset:
+        return self.device.gateset
+
+    def _build_hardware_artifact(self, name: str) -> Any:
+        if name == "device":
+            return GenericDevice(self.hardware)
+        return super()._build_hardware_artifact(name)
+
+    def compile(self, qasm_file: str, optimization_level: int = 1, active_phases: Optional[List[str]] = None, seed: Optional[int] = None,
+                save_checkpoints: bool = False, resume_from: Optional[str] = None,
+                native_metrics: bool = True) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         if active_phases is None:
             active_phases = ["rebase", "mapping", "optimization"]
 
-        if "rebase" in active_phases:
-            try:
-                optimized_circuit = cirq.optimize_for_target_gateset(
-                    optimized_circuit,
-                    gateset=cirq.CZTargetGateset()
-                )
-            except Exception as e:
-                print(f"Cirq Rebase Error: {e}")
+        pipeline = self.pipeline(active_phases, optimization_level)
+        timer = PhaseTimer()
+        timer.record("setup", *self.take_setup_times())
+        try:
+            optimized_circuit, parse_times = self.load_circuit(qasm_file)
+        except Exception as e:
+            print(f"Cirq QASM Import Error: {e}")
+            return None, None
+        timer.record("parse", *parse_times)
 
+        steps = []
+        if "rebase" in active_phases:
+            steps.append(("rebase", "rebase", lambda circuit: self._rebase_circuit(circuit, pipeline)))
         if "optimization" in active_phases:
-            optimized_circuit = self._optimize_circuit(optimized_circuit)
-
+            steps.append(("optimization", None, self._optimize_circuit))
         if "mapping" in active_phases:
-            optimized_circuit = self._map_circuit(optimized_circuit, optimization_level)
-
+            # The layout step passes (circuit, initial mapping) on to the routing.
+            steps.append(("mapping", "layout", lambda circuit: (circuit, self._initial_mapping(circuit, pipeline))))
+            steps.append(("mapping", None, lambda state: self._map_circuit(*state, pipeline)))
         if "optimization" in active_phases:
-            optimized_circuit = cirq.drop_empty_moments(optimized_circuit)
+            steps.append(("optimization", None, cirq.drop_empty_moments))
+
+        options = {"active_phases": active_phases, "opt_level": optimization_level}
+        optimized_circuit = self.run_steps(optimized_circuit, steps, timer, qasm_file, options,
+                                           save_checkpoints, resume_from)
 
-        duration = time.time() - start_time
-        metrics = self._calculate_metrics(optimized_circuit)
-        metrics["compile_time"] = duration
-        metrics["initial"] = initial_metrics
+        metrics = self.native_metrics(optimized_circuit) if native_metrics else {}
 
-        filename = self._save_circuit(optimized_circuit, qasm_file, optimization_level)
+        with timer.phase("export"):
+            filename = self._save_circuit(optimized_circuit, qasm_file, optimization_level)
+        metrics.update(timer.metrics())
         if not filename:
              return metrics, None
 
         return metrics, filename
 
+    def _parse_circuit(self, qasm_file: str) -> cirq.Circuit:
+        with open(qasm_file, 'r') as f:
+            qasm_str = f.read()
+
+        # Remove barriers as they might cause issues in import
+        return circuit_from_qasm(BARRIER_PATTERN.sub("", qasm_str))
+
     def _calculate_metrics(self, circuit: cirq.Circuit) -> Dict[str, Any]:
         operations = list(circuit.all_operations())
         return {
@@ -137,23 +158,47 @@ class CirqAdapter(CompilerAdapter):
         circuit = cirq.drop_empty_moments(circuit)
         return cirq.synchronize_terminal_measurements(circuit)
 
-    def _map_circuit(self, circuit: cirq.Circuit, optimization_level: int) -> cirq.Circuit:
+    def _build_pipeline(self, active_phases: Optional[List[str]], optimization_level: int,
+                        seed: Optional[int]) -> Dict[str, Any]:
+        """Returns the target gateset of the rebase, the initial mapper, and the router with its lookahead radius."""
         lookahead = 0
         if optimization_level == 1: lookahead = 1
         if optimization_level >= 2: lookahead = 2
+        return {
+            "gateset": cirq.CZTargetGateset(),
+            "mapper": cirq.LineInitialMapper(self.device_graph),
+            "router": cirq.RouteCQC(self.device_graph),
+            "lookahead": lookahead,
+        }
+
+    def _rebase_circuit(self, circuit: cirq.Circuit, pipeline: Dict[str, Any]) -> cirq.Circuit:
+        try:
+            return cirq.optimize_for_target_gateset(circuit, gateset=pipeline["gateset"])
+        except Exception as e:
+            print(f"Cirq Rebase Error: {e}")
+            return circuit
+
+    def _initial_mapping(self, circuit: cirq.Circuit, pipeline: Dict[str, Any]) -> Optional[Dict[cirq.Qid, cirq.Qid]]:
+        """Selects the initial layout RouteCQC would choose (LineInitialMapper), or None if that fails."""
+        try:
+            return pipeline["mapper"].initial_mapping(circuit)
+        except Exception as e:
+            print(f"Cirq Layout Error: {e}")
+            return None
 
+    def _map_circuit(self, circuit: cirq.Circuit, initial_mapping: Optional[Dict[cirq.Qid, cirq.Qid]],
+                     pipeline: Dict[str, Any]) -> cirq.Circuit:
         try:
-            router = cirq.RouteCQC(self.device_graph)
-            return router(circuit, lookahead_radius=lookahead)
+            initial_mapper = cirq.HardCodedInitialMapper(initial_mapping) if initial_mapping is not None else None
+            return pipeline["router"](circuit, lookahead_radius=pipeline["lookahead"], initial_mapper=initial_mapper)
         except Exception as e:
             print(f"Cirq Routing Error: {e}")
             return circuit
 
     def _save_circuit(self, circuit: cirq.Circuit, original_file: str, opt_level: int) -> Optional[str]:
         try:
-            _, file = os.path.split(original_file.removesuffix(".qasm"))
-            filename = os.path.join(self.export_dir, f"{file}_cirq_opt{opt_level}.qasm")
-            circuit.save_qasm(filename)
+            filename = self._export_path(original_file, opt_level)
+            self._write_atomic(filename, circuit.save_qasm)
             return filename
         except Exception as e:
             print(f"Cirq QASM Export Error: {e}")
@@ -1,7 +1,6 @@
-import os
-import time
 from typing import Optional, Tuple, Dict, Any, List
 
+import pytket
 from pytket import OpType
 from pytket._tket.passes import AutoRebase, RebaseTket
 from pytket.architecture import Architecture
@@ -15,18 +14,46 @@ from pytket.passes import (
 from pytket.qasm import circuit_from_qasm, circuit_to_qasm
 
 from quantum_bench.hardware.model import HardwareModel
-from .base import CompilerAdapter
+from .base import CompilerAdapter, PhaseTimer
 
 
 class PytketAdapter(CompilerAdapter):
     """Adapter for the Pytket compiler."""
 
+    hardware_artifacts = ["architecture"]
+
     def __init__(self, hardware: HardwareModel, export_dir: str = None):
         super().__init__("Pytket", hardware, export_dir)
-        self.architecture = Architecture(hardware.coupling_map)
-        self.mapping_manager = MappingManager(self.architecture)
+        self._mapping_manager: Optional[MappingManager] = None
         self.basis_gates = self._define_gateset()
 
+    @property
+    def version(self) -> str:
+        return pytket.__version__
+
+    @property
+    def architecture(self) -> Architecture:
+        return self.hardware_artifact("architecture")
+
+    @property
+    def mapping_manager(self) -> MappingManager:
+        if self._mapping_manager is None:
+            self.prepare()
+        return self._mapping_manager
+
+    def prepare(self) -> Tuple[Optional[float], ...]:
+        super().prepare()
+        # MappingManager cannot be pickled, it is rebuilt from the cached architecture.
+        if self._mapping_manager is None:
+            with self._setup_timer.phase("setup"):
+                self._mapping_manager = MappingManager(self.architecture)
+        return self.setup_times
+
+    def _build_hardware_artifact(self, name: str) -> Any:
+        if name == "architecture":
+            return Architecture(self.hardware.coupling_map)
+        return super()._build_hardware_artifact(name)
+
     def _define_gateset(self):
         gate_map = {
             "x": OpType.X,
@@ -45,57 +72,91 @@ class PytketAdapter(CompilerAdapter):
         }
         return {gate_map[g.lower()] for g in self.hardware.basis_gates if g.lower() in gate_map}
 
-    def compile(self, qasm_file: str, optimization_level: int = 1, active_phases: Optional[List[str]] = None, seed: Optional[int] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    def compile(self, qasm_file: str, optimization_level: int = 1, active_phases: Optional[List[str]] = None, seed: Optional[int] = None,
+                save_checkpoints: bool = False, resume_from: Optional[str] = None,
+                native_metrics: bool = True) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        if active_phases is None:
+            active_phases = ["rebase", "mapping", "optimization"]
+
+        pipeline = self.pipeline(active_phases, optimization_level)
+        timer = PhaseTimer()
+        timer.record("setup", *self.take_setup_times())
         try:
-            circuit = circuit_from_qasm(qasm_file, maxwidth=128)
+            circuit, parse_times = self.load_circuit(qasm_file)
         except Exception as e:
             print(f"Pytket QASM Import Error: {e}")
             return None, None
+        timer.record("parse", *parse_times)
 
-        initial_metrics = self._calculate_metrics(circuit)
-        initial_metrics["compile_time"] = '-'
+        # Labelling and routing run in one route_circuit call, so there is no layout checkpoint.
+        steps = []
+        if "rebase" in pipeline:
+            steps.append(("rebase", "rebase", lambda c: self._rebase_circuit(c, pipeline)))
+        if "optimization" in pipeline:
+            steps.append(("optimization", None, lambda c: self._apply_passes(c, pipeline["optimization"])))
+        if "mapping" in pipeline:
+            steps.append(("mapping", None, lambda c: self._route_circuit(c, pipeline["mapping"])))
+        if "optimization" in pipeline:
+            steps.append(("optimization", None, lambda c: self._apply_passes(c, pipeline["post_mapping_optimization"])))
 
-        start_time = time.time()
+        options = {"active_phases": active_phases, "opt_level": optimization_level}
+        circuit = self.run_steps(circuit, steps, timer, qasm_file, options, save_checkpoints, resume_from)
 
-        if active_phases is None:
-            active_phases = ["rebase", "mapping", "optimization"]
+        metrics = self.native_metrics(circuit) if native_metrics else {}
+
+        with timer.phase("export"):
+            circuit.remove_blank_wires()
+            filename = self._save_circuit(circuit, qasm_file, optimization_level)
+        metrics.update(timer.metrics())
 
+        return (metrics, filename) if filename else (metrics, None)
+
+    def _build_pipeline(self, active_phases: Optional[List[str]], optimization_level: int,
+                        seed: Optional[int]) -> Dict[str, Any]:
+        """Returns the passes of every active phase, keyed by phase."""
+        pipeline = {}
         if "rebase" in active_phases:
             try:
-                DecomposeBoxes().apply(circuit)
-                AutoRebase(self.basis_gates).apply(circuit)
+                pipeline["rebase"] = [DecomposeBoxes(), AutoRebase(self.basis_gates)]
             except Exception:
-                RebaseTket().apply(circuit)
+                pipeline["rebase"] = [DecomposeBoxes(), RebaseTket()]
+            pipeline["rebase_fallback"] = RebaseTket()
 
         if "optimization" in active_phases:
-            FullPeepholeOptimise().apply(circuit)
-            CliffordSimp().apply(circuit)
-            ContextSimp().apply(circuit)
+            pipeline["optimization"] = [FullPeepholeOptimise(), CliffordSimp(), ContextSimp()]
+            # Without allow_swaps=False, routed SWAPs become implicit wire permutations, which the QASM export
+            # drops, leaving gates on uncoupled qubits.
+            pipeline["post_mapping_optimization"] = [PeepholeOptimise2Q(allow_swaps=False),
+                                                     KAKDecomposition(allow_swaps=False), RemoveRedundancies()]
 
         if "mapping" in active_phases:
             # Lookahead based on Opt-Level
             lookahead = 0
             if optimization_level == 1: lookahead = 2
             if optimization_level >= 2: lookahead = 5
+            pipeline["mapping"] = [LexiLabellingMethod(), LexiRouteRoutingMethod(lookahead)]
 
-            lexi_label = LexiLabellingMethod()
-            lexi_route = LexiRouteRoutingMethod(lookahead)
-            self.mapping_manager.route_circuit(circuit, [lexi_label, lexi_route])
+        return pipeline
 
-        if "optimization" in active_phases:
-            PeepholeOptimise2Q().apply(circuit)
-            KAKDecomposition().apply(circuit)
-            RemoveRedundancies().apply(circuit)
-
-        duration = time.time() - start_time
-        metrics = self._calculate_metrics(circuit)
-        metrics["compile_time"] = duration
-        metrics["initial"] = initial_metrics
-
-        circuit.remove_blank_wires()
-        filename = self._save_circuit(circuit, qasm_file, optimization_level)
-        
-        return (metrics, filename) if filename else (metrics, None)
+    @staticmethod
+    def _apply_passes(circuit, passes):
+        for compiler_pass in passes:
+            compiler_pass.apply(circuit)
+        return circuit
+
+    def _rebase_circuit(self, circuit, pipeline: Dict[str, Any]):
+        try:
+            return self._apply_passes(circuit, pipeline["rebase"])
+        except Exception:
+            pipeline["rebase_fallback"].apply(circuit)
+            return circuit
+
+    def _route_circuit(self, circuit, methods):
+        self.mapping_manager.route_circuit(circuit, methods)
+        return circuit
+
+    def _parse_circuit(self, qasm_file: str):
+        return circuit_from_qasm(qasm_file, maxwidth=128)
 
     def _calculate_metrics(self, circuit) -> Dict[str, Any]:
         return {
@@ -107,9 +168,8 @@ class PytketAdapter(CompilerAdapter):
 
     def _save_circuit(self, circuit, original_file: str, opt_level: int) -> Optional[str]:
         try:
-            _, file = os.path.split(original_file.removesuffix(".qasm"))
-            filename = os.path.join(self.export_dir, f"{file}_pytket_opt{opt_level}.qasm")
-            circuit_to_qasm(circuit, filename, maxwidth=128)
+            filename = self._export_path(original_file, opt_level)
+            self._write_atomic(filename, lambda path: circuit_to_qasm(circuit, path, maxwidth=128))
             return filename
         except Exception as e:
             print(f"Pytket QASM Export Error: {e}")
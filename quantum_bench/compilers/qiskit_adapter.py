@@ -1,17 +1,16 @@
-import os
-import time
 from typing import Optional, Tuple, Dict, Any, List
 
 from cirq_ionq import GPIGate, GPI2Gate, ZZGate
 from mqt.bench.targets.gatesets.rigetti import RXPIGate, RXPI2Gate, RXPI2DgGate
-from qiskit import QuantumCircuit, transpile, qasm2
+import qiskit
+from qiskit import QuantumCircuit, qasm2, qpy
 from qiskit.circuit import Delay
 from qiskit.circuit.library import (
     XGate, YGate, ZGate, SXGate, RZGate, RXGate, RYGate, HGate,
     CXGate, CZGate, IGate, Measure, Reset, SwapGate, ECRGate, iSwapGate
 )
 from qiskit.circuit.equivalence_library import SessionEquivalenceLibrary
-from qiskit.transpiler import Target, PassManager
+from qiskit.transpiler import Target, PassManager, generate_preset_pass_manager
 from qiskit.transpiler.passes import (
     Optimize1qGatesDecomposition, CommutativeCancellation,
     RemoveResetInZeroState, Collect2qBlocks, ConsolidateBlocks,
@@ -21,15 +20,31 @@ from qiskit.transpiler.passes import (
 )
 
 from quantum_bench.hardware.model import HardwareModel
-from .base import CompilerAdapter
+from .base import CompilerAdapter, PhaseTimer
 
 
 class QiskitAdapter(CompilerAdapter):
     """Adapter for the Qiskit compiler."""
 
+    hardware_artifacts = ["target"]
+    checkpoint_suffix = ".qpy"
+    uses_seed = True
+
     def __init__(self, hardware: HardwareModel, export_dir: str = None):
         super().__init__("Qiskit", hardware, export_dir)
-        self.target = self._build_target()
+
+    @property
+    def version(self) -> str:
+        return qiskit.__version__
+
+    @property
+    def target(self) -> Target:
+        return self.hardware_artifact("target")
+
+    def _build_hardware_artifact(self, name: str) -> Any:
+        if name == "target":
+            return self._build_target()
+        return super()._build_hardware_artifact(name)
 
     def _build_target(self) -> Target:
         """Creates a Qiskit Target object from the hardware configuration."""
@@ -75,48 +90,105 @@ class QiskitAdapter(CompilerAdapter):
 
         return target
 
-    def compile(self, qasm_file: str, optimization_level: int = 1, active_phases: Optional[List[str]] = None, seed: Optional[int] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    def compile(self, qasm_file: str, optimization_level: int = 1, active_phases: Optional[List[str]] = None, seed: Optional[int] = None,
+                save_checkpoints: bool = False, resume_from: Optional[str] = None,
+                native_metrics: bool = True) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        pipeline = self.pipeline(active_phases, optimization_level, seed)
+        timer = PhaseTimer()
+        timer.record("setup", *self.take_setup_times())
         try:
-            circuit = QuantumCircuit.from_qasm_file(qasm_file)
+            circuit, parse_times = self.load_circuit(qasm_file)
         except Exception as e:
             print(f"Qiskit QASM Import Error: {e}")
             return None, None
+        timer.record("parse", *parse_times)
 
-        initial_metrics = self._calculate_metrics(circuit)
-        initial_metrics["compile_time"] = '-'
+        # The preset pass managers interleave the phases, so without active phases only the total is measured
+        # and there are no checkpoints.
+        options = {"active_phases": active_phases, "opt_level": optimization_level, "seed": seed}
+        circuit = self.run_steps(circuit, [(phase, checkpoint, pm.run) for phase, checkpoint, pm in pipeline],
+                                 timer, qasm_file, options, save_checkpoints, resume_from)
 
-        start_time = time.time()
+        metrics = self.native_metrics(circuit) if native_metrics else {}
 
-        if active_phases is None:
-            transpiled_circuit = transpile(
-                circuit,
-                target=self.target,
-                optimization_level=optimization_level,
-                seed_transpiler=seed,
-            )
-        else:
-            transpiled_circuit = self._run_custom_pass_manager(circuit, active_phases, optimization_level, seed)
-
-        duration = time.time() - start_time
-        metrics = self._calculate_metrics(transpiled_circuit)
-        metrics["compile_time"] = duration
-        metrics["initial"] = initial_metrics
-
-        filename = self._save_circuit(transpiled_circuit, qasm_file, optimization_level)
+        with timer.phase("export"):
+            filename = self._save_circuit(circuit, qasm_file, optimization_level)
+        metrics.update(timer.metrics())
         return (metrics, filename) if filename else (metrics, None)
 
-    def _run_custom_pass_manager(self, circuit, active_phases, optimization_level, seed):
-        pm = PassManager()
+    def compile_many(self, qasm_files: List[str], optimization_level: int = 1,
+                     active_phases: Optional[List[str]] = None, seed: Optional[int] = None,
+                     num_processes: Optional[int] = None,
+                     native_metrics: bool = True) -> List[Tuple[Optional[Dict[str, Any]], Optional[str]]]:
+        """
+        Compiles many circuits, running every phase as one PassManager.run call on all circuits.
+
+        Qiskit distributes such a batch over num_processes processes. The wall-clock time of every phase is measured
+        for the whole batch and split evenly among its circuits; the CPU time only covers this process.
+        The setup of the batch is reported by its first circuit.
+        """
+        pipeline = self.pipeline(active_phases, optimization_level, seed)
+        results: List[Tuple[Optional[Dict[str, Any]], Optional[str]]] = [(None, None)] * len(qasm_files)
+        loaded = []
+        for index, qasm_file in enumerate(qasm_files):
+            try:
+                circuit, parse_times = self.load_circuit(qasm_file)
+                loaded.append((index, circuit, parse_times, self.input_metrics() if native_metrics else None))
+            except Exception as e:
+                print(f"Qiskit QASM Import Error: {e}")
+        if not loaded:
+            return results
+
+        batch_timer = PhaseTimer()
+        circuits = [circuit for _, circuit, _, _ in loaded]
+        for phase, _, pm in pipeline:
+            with batch_timer.phase(phase):
+                circuits = pm.run(circuits, num_processes=num_processes)
+
+        for (index, _, parse_times, initial_metrics), circuit in zip(loaded, circuits):
+            timer = PhaseTimer()
+            timer.record("setup", *self.take_setup_times())
+            timer.record("parse", *parse_times)
+            for phase in dict.fromkeys(phase for phase, _, _ in pipeline):
+                wall_time, cpu_time, peak_rss, peak_traced = batch_timer.measurement(phase)
+                timer.record(phase, wall_time / len(loaded), cpu_time / len(loaded), peak_rss, peak_traced)
+
+            metrics = {}
+            if native_metrics:
+                metrics = self._calculate_metrics(circuit)
+                metrics["initial"] = initial_metrics
+            with timer.phase("export"):
+                filename = self._save_circuit(circuit, qasm_files[index], optimization_level)
+            metrics.update(timer.metrics())
+            results[index] = (metrics, filename)
+        return results
+
+    def _build_pipeline(self, active_phases: Optional[List[str]], optimization_level: int,
+                        seed: Optional[int]) -> List[Tuple[str, Optional[str], PassManager]]:
+        """
+        Returns the (phase, checkpoint, PassManager) steps of the active phases in execution order,
+        or the preset pass manager as single 'compile' step.
+
+        There is no 'layout' checkpoint: SabreLayout keeps the best routed result of its layout trials, so
+        separating layout selection from routing would make the mapping considerably worse.
+        """
+        if active_phases is None:
+            return [("compile", None, generate_preset_pass_manager(
+                optimization_level=optimization_level, target=self.target, seed_transpiler=seed))]
 
+        pipeline = []
         if "rebase" in active_phases:
-            pm.append(Unroll3qOrMore(self.target))
+            pipeline.append(("rebase", "rebase", PassManager([Unroll3qOrMore(self.target)])))
 
         if "mapping" in active_phases:
+            pm = PassManager()
             pm.append(SabreLayout(self.target, seed=seed))
             pm.append(SabreSwap(self.target.build_coupling_map(), seed=seed))
+            pipeline.append(("mapping", None, pm))
 
         if "optimization" in active_phases:
-            pm.append(BasisTranslator(SessionEquivalenceLibrary, target=self.target))
+            pm = PassManager()
+            pm.append(BasisTranslator(SessionEquivalenceLibrary, target_basis=None, target=self.target))
             pm.append([Optimize1qGatesDecomposition(target=self.target), RemoveResetInZeroState()])
             pm.append(InverseCancellation([(CXGate(), CXGate())]))
             pm.append(CommutativeCancellation())
@@ -129,8 +201,26 @@ class QiskitAdapter(CompilerAdapter):
                 ])
 
             pm.append([RemoveDiagonalGatesBeforeMeasure(), RemoveFinalReset()])
+            pipeline.append(("optimization", None, pm))
+
+        return pipeline
+
+    def _checkpoint_options(self, name: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        # Only the Sabre passes after the rebase use the seed, so all seeds share the rebase checkpoint.
+        if name == "rebase":
+            return {key: value for key, value in options.items() if key != "seed"}
+        return options
+
+    def _dump_checkpoint(self, state: QuantumCircuit, path: str):
+        with open(path, "wb") as f:
+            qpy.dump(state, f)
+
+    def _load_checkpoint(self, path: str) -> QuantumCircuit:
+        with open(path, "rb") as f:
+            return qpy.load(f)[0]
 
-        return pm.run(circuit)
+    def _parse_circuit(self, qasm_file: str) -> QuantumCircuit:
+        return QuantumCircuit.from_qasm_file(qasm_file)
 
     def _calculate_metrics(self, circuit: QuantumCircuit) -> Dict[str, Any]:
         operations = circuit.count_ops()
@@ -143,9 +233,8 @@ class QiskitAdapter(CompilerAdapter):
 
     def _save_circuit(self, circuit: QuantumCircuit, original_file: str, opt_level: int) -> Optional[str]:
         try:
-            _, file = os.path.split(original_file.removesuffix(".qasm"))
-            filename = os.path.join(self.export_dir, f"{file}_qiskit_opt{opt_level}.qasm")
-            qasm2.dump(circuit, filename)
+            filename = self._export_path(original_file, opt_level)
+            self._write_atomic(filename, lambda path: qasm2.dump(circuit, path))
             return filename
         except Exception as e:
             print(f"Qiskit QASM Export Error: {e}")
@@ -0,0 +1,73 @@
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Dict, List, Type, Union
+
+from .base import CompilerAdapter
+
+# Entry point group under which other packages can register adapters,
+# e.g. in pyproject.toml: [project.entry-points."quantum_bench.compilers"] MyCompiler = "my_package.adapter:MyAdapter"
+ENTRY_POINT_GROUP = "quantum_bench.compilers"
+
+# Adapters as 'module:Class' references (imported on first use) or as classes, keyed by compiler name.
+_adapters: Dict[str, Union[str, Type[CompilerAdapter]]] = {
+    "Cirq": "quantum_bench.compilers.cirq_adapter:CirqAdapter",
+    "Pytket": "quantum_bench.compilers.pytket_adapter:PytketAdapter",
+    "Qiskit": "quantum_bench.compilers.qiskit_adapter:QiskitAdapter",
+}
+
+_entry_points_loaded = False
+
+
+def register_adapter(name: str, adapter: Union[str, Type[CompilerAdapter]]):
+    """
+    Registers a compiler adapter under a name.
+
+    Args:
+        name: Name of the compiler as used in the result files.
+        adapter: The adapter class, or a 'module:Class' reference that is only imported when the compiler is used.
+    """
+    _adapters[name] = adapter
+
+
+def available_compilers() -> List[str]:
+    """Returns the names of all registered compilers, including those registered through entry points."""
+    _load_entry_points()
+    return list(_adapters)
+
+
+def get_adapter_class(name: str) -> Type[CompilerAdapter]:
+    """
+    Returns the adapter class of a compiler, importing its module on first use.
+
+    Args:
+        name: Name of the compiler.
+
+    Returns:
+        The CompilerAdapter subclass.
+    """
+    _load_entry_points()
+    if name not in _adapters:
+        raise KeyError(f"Unknown compiler: {name}. Available: {list(_adapters)}")
+
+    adapter = _adapters[name]
+    if isinstance(adapter, str):
+        module_name, class_name = adapter.split(":")
+        adapter = getattr(import_module(module_name), class_name)
+        _adapters[name] = adapter
+    return adapter
+
+
+def get_adapter_module(name: str) -> str:
+    """Returns the module defining the adapter of a compiler without importing it."""
+    _load_entry_points()
+    adapter = _adapters[name]
+    return adapter.split(":")[0] if isinstance(adapter, str) else adapter.__module__
+
+
+def _load_entry_points():
+    global _entry_points_loaded
+    if _entry_points_loaded:
+        return
+    _entry_points_loaded = True
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        _adapters.setdefault(entry_point.name, entry_point.value)
@@ -1,18 +1,32 @@
+import hashlib
+import json
 import os
-from typing import Optional
-
-from mqt.bench import get_benchmark, BenchmarkLevel
-from mqt.bench.targets import get_device
-from mqt.qcec import verify
-from qiskit import QuantumCircuit, qasm2
+from importlib.metadata import version
+from typing import Optional, Dict
 
 from quantum_bench.hardware.model import HardwareModel
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+BENCHMARK_LEVELS = ["ALG", "INDEP", "NATIVEGATES", "MAPPED"]
+TARGET_LEVELS = ["NATIVEGATES", "MAPPED"]
+CIRCUIT_INDEX_FILE = "circuit_index.json"
+MQT_BENCH_VERSION = version("mqt.bench")
+
+# Circuit cache indices of the current process, keyed by absolute cache directory.
+_circuit_indices: Dict[str, Dict[str, str]] = {}
+
 
 def get_circuit(hardware_name: str, algo_name: str, num_qubits: int, benchmark_level: str, export_dir: str = "benchmarks_cache") -> Optional[str]:
     """
     Loads a benchmark circuit and returns the path to the OpenQASM 2 file.
 
+    Generated circuits are cached on disk, keyed by algorithm, size, level, target and MQT Bench version.
+    Cached circuits are returned without calling MQT Bench.
+
     Args:
         hardware_name: Name of the target hardware.
         algo_name: Name of the algorithm (e.g., 'dj', 'ghz', 'qft').
@@ -24,26 +38,35 @@ def get_circuit(hardware_name: str, algo_name: str, num_qubits: int, benchmark_l
         Path to the generated QASM file or None if generation fails.
     """
     try:
-        level_map = {
-            "ALG": BenchmarkLevel.ALG,
-            "INDEP": BenchmarkLevel.INDEP,
-            "NATIVEGATES": BenchmarkLevel.NATIVEGATES,
-            "MAPPED": BenchmarkLevel.MAPPED
-        }
-        
-        if benchmark_level not in level_map:
+        if benchmark_level not in BENCHMARK_LEVELS:
             raise ValueError(f"Unknown benchmark level: {benchmark_level}")
 
-        kwargs = {"benchmark": algo_name, "level": level_map[benchmark_level], "circuit_size": num_qubits}
-        if benchmark_level in ["NATIVEGATES", "MAPPED"]:
-            kwargs["target"] = get_device(hardware_name)
+        target = hardware_name if benchmark_level in TARGET_LEVELS else None
+        cache_key = _circuit_cache_key(algo_name, num_qubits, benchmark_level, target)
+        index = _load_circuit_index(export_dir)
+        if cache_key in index:
+            return os.path.join(export_dir, index[cache_key])
+
+        from mqt.bench import get_benchmark, BenchmarkLevel
+        from mqt.bench.targets import get_device
+        from qiskit import qasm2
+
+        kwargs = {"benchmark": algo_name, "level": getattr(BenchmarkLevel, benchmark_level), "circuit_size": num_qubits}
+        if target:
+            kwargs["target"] = get_device(target)
 
         qc = get_benchmark(**kwargs)
 
         os.makedirs(export_dir, exist_ok=True)
-        filename = os.path.join(export_dir, f"{benchmark_level}_{algo_name}_{num_qubits}.qasm")
-        qasm2.dump(qc, filename)
-
+        name_parts = [benchmark_level, algo_name, str(num_qubits)] + ([target] if target else [])
+        file = f"{'_'.join(name_parts)}_{cache_key[:8]}.qasm"
+        filename = os.path.join(export_dir, file)
+        tmp_filename = f"{filename}.{os.getpid()}.tmp"
+        qasm2.dump(qc, tmp_filename)
+        os.replace(tmp_filename, filename)
+
+        index[cache_key] = file
+        _save_circuit_index(export_dir, index)
         return filename
 
     except Exception as e:
@@ -51,6 +74,54 @@ def get_circuit(hardware_name: str, algo_name: str, num_qubits: int, benchmark_l
         return None
 
 
+def _circuit_cache_key(algo_name: str, num_qubits: int, benchmark_level: str, target: Optional[str]) -> str:
+    key = json.dumps([algo_name, num_qubits, benchmark_level, target, MQT_BENCH_VERSION])
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def _load_circuit_index(export_dir: str) -> Dict[str, str]:
+    """Loads the circuit cache index once per process, dropping entries whose files are gone."""
+    export_dir = os.path.abspath(export_dir)
+    if export_dir not in _circuit_indices:
+        _circuit_indices[export_dir] = _read_circuit_index(export_dir)
+    return _circuit_indices[export_dir]
+
+
+def _read_circuit_index(export_dir: str) -> Dict[str, str]:
+    index = {}
+    index_file = os.path.join(export_dir, CIRCUIT_INDEX_FILE)
+    if os.path.exists(index_file):
+        try:
+            with open(index_file, "r") as f:
+                index = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Ignoring unreadable circuit cache index {index_file}: {e}")
+    return {key: file for key, file in index.items() if os.path.exists(os.path.join(export_dir, file))}
+
+
+def _save_circuit_index(export_dir: str, index: Dict[str, str]):
+    """
+    Merges the index into the one on disk and writes it back.
+
+    The merge runs under a lock, so entries added by other processes since this process read the index are kept.
+    The merged entries are also added to the given index.
+    """
+    index_file = os.path.join(export_dir, CIRCUIT_INDEX_FILE)
+    # The index file itself is replaced on every write, so the lock is held on a separate file.
+    with open(f"{index_file}.lock", "a") as lock:
+        if fcntl:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            index.update({key: file for key, file in _read_circuit_index(export_dir).items() if key not in index})
+            tmp_file = f"{index_file}.{os.getpid()}.tmp"
+            with open(tmp_file, "w") as f:
+                json.dump(index, f, indent=1, sort_keys=True)
+            os.replace(tmp_file, index_file)
+        finally:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
 def verify_circuit(qasm_file: str, compiled_qasm_file: str) -> str:
     """
     Verifies the equivalence between the original and compiled circuit using MQT QCEC.
@@ -63,6 +134,7 @@ def verify_circuit(qasm_file: str, compiled_qasm_file: str) -> str:
         Result of the equivalence check (e.g., "equivalent", "not_equivalent", "error").
     """
     try:
+        from mqt.qcec import verify
         result = verify(qasm_file, compiled_qasm_file, check_partial_equivalence=True, transform_dynamic_circuit=True)
         return result.equivalence.name
     except Exception as e:
@@ -86,6 +158,7 @@ def visualize_circuit(qasm_file: str, hardware: str, visualisation_path: str = "
         _, file = os.path.split(qasm_file.removesuffix(".qasm"))
         filename = os.path.join(circuit_dir, f"{file}.png")
         
+        from qiskit import QuantumCircuit
         QuantumCircuit.from_qasm_file(qasm_file).draw(output="mpl", filename=filename, idle_wires=False)
     except Exception as e:
         print(f"Visualization of {qasm_file} failed: {e}")
@@ -102,6 +175,7 @@ def get_hardware_model(device_name: str) -> Optional[HardwareModel]:
         HardwareModel instance or None if loading fails.
     """
     try:
+        from mqt.bench.targets import get_device
         device = get_device(device_name)
         return HardwareModel(
             name=device_name,
@@ -0,0 +1,372 @@
+import itertools
+import math
+import os
+import shutil
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any, Iterator, Tuple
+
+from quantum_bench.artifacts import DEFAULT_STORE_DIR, ArtifactStore, artifact_key
+from quantum_bench.compilers.base import CompilerAdapter
+from quantum_bench.compilers.registry import get_adapter_class, get_adapter_module
+import quantum_bench.data.mqt_provider as mqt
+from quantum_bench.hardware.model import HardwareModel
+from quantum_bench.isolation import IsolatedPool, get_context
+from quantum_bench.qasm import compute_metrics, interaction_pairs, iter_operations, qubit_labels
+from quantum_bench.results import ResultKey, make_key
+
+# Transient row field holding the (original, compiled) QASM paths of a pending equivalence check.
+VERIFICATION_FIELD = "_verification"
+
+# Adapters of the current process, keyed by (hardware name, compiler name).
+_adapters: Dict[Tuple[str, str], CompilerAdapter] = {}
+
+# Hardware models made available to the worker processes by the pool initializer.
+_worker_hardware: Dict[str, HardwareModel] = {}
+
+# Metrics of the input circuits computed by the QASM metric engine, keyed by QASM path.
+_input_metrics: Dict[str, Dict[str, int]] = {}
+
+# Trivial layout SWAP estimates of the input circuits, keyed by (hardware name, QASM path).
+_swap_estimates: Dict[Tuple[str, str], Optional[int]] = {}
+
+
+@dataclass
+class BenchmarkJob:
+    """A single compiler run of the benchmark job matrix."""
+    hardware: str
+    benchmark_level: str
+    algorithm: str
+    qubits: int
+    compiler: str
+    opt_level: int
+    run: int
+    qasm_path: str
+    active_phases: Optional[List[str]] = None
+    seed: Optional[int] = None
+    run_verification: bool = False
+    run_visualisation: bool = False
+    is_reference: bool = False
+    visualisation_path: str = "visualisation"
+    metric_source: str = "qasm"
+    artifact_dir: str = DEFAULT_STORE_DIR
+    save_checkpoints: bool = False
+    resume_from: Optional[str] = None
+    check_compliance: bool = False
+
+    @property
+    def key(self) -> ResultKey:
+        """Key identifying the job in the result files."""
+        return make_key(self.hardware, self.benchmark_level, self.algorithm, self.qubits,
+                        self.compiler, self.opt_level, self.run)
+
+
+def get_adapter(hardware: HardwareModel, compiler_name: str) -> CompilerAdapter:
+    """
+    Returns the adapter of the given compiler for the hardware, creating it once per process.
+
+    Args:
+        hardware: The target hardware model.
+        compiler_name: Name of the compiler (see quantum_bench.compilers.registry).
+
+    Returns:
+        The cached CompilerAdapter instance.
+    """
+    key = (hardware.name, compiler_name)
+    if key not in _adapters:
+        _adapters[key] = get_adapter_class(compiler_name)(hardware)
+    return _adapters[key]
+
+
+def execute_job(job: BenchmarkJob, hardware: HardwareModel) -> Dict[str, Any]:
+    """
+    Compiles the circuit of a job and returns its result row.
+
+    Args:
+        job: The job to execute.
+        hardware: The hardware model referenced by the job.
+
+    Returns:
+        The result row as a dictionary.
+    """
+    row = _key_row(job)
+
+    try:
+        compiler = get_adapter(hardware, job.compiler)
+        # Only passed when used, so adapters without checkpoint support keep working.
+        checkpoint_options = {}
+        if job.save_checkpoints:
+            checkpoint_options["save_checkpoints"] = True
+        if job.resume_from:
+            checkpoint_options["resume_from"] = job.resume_from
+            row["checkpoint"] = job.resume_from
+        metrics, compiled_qasm_path = compiler.compile(
+            qasm_file=job.qasm_path,
+            optimization_level=job.opt_level,
+            active_phases=job.active_phases,
+            seed=job.seed,
+            native_metrics=job.metric_source == "native",
+            **checkpoint_options
+        )
+
+        if metrics and compiled_qasm_path and job.metric_source == "qasm":
+            metrics.update(compute_metrics(compiled_qasm_path))
+            metrics["initial"] = input_metrics(job.qasm_path)
+
+        if metrics:
+            row.update(metrics)
+            row["trivial_layout_swap_estimate"] = trivial_layout_swap_estimate(hardware, job.qasm_path)
+        row["success"] = bool(metrics)
+        row["status"] = "ok" if metrics else "error"
+
+        if job.check_compliance and compiled_qasm_path:
+            violation = compliance_violation(hardware, compiled_qasm_path)
+            row["compliant"] = violation is None
+            if violation:
+                print(f"{job.compiler} opt{job.opt_level} result is not executable on {hardware.name}: {violation}")
+
+        if job.run_visualisation and compiled_qasm_path and job.is_reference:
+            mqt.visualize_circuit(compiled_qasm_path, job.hardware, job.visualisation_path)
+
+        if job.run_verification and compiled_qasm_path:
+            # Verified asynchronously by the caller on a private copy, the export is removed below.
+            row["Equivalence"] = "Pending"
+            row[VERIFICATION_FIELD] = (job.qasm_path, _stage_for_verification(compiled_qasm_path, job))
+
+        if compiled_qasm_path:
+            row["artifact"] = _store_artifact(compiled_qasm_path, job, compiler, hardware)
+
+    except Exception as e:
+        row["success"] = False
+        row["status"] = "error"
+        print(f"Error during compilation: {e}")
+
+    return row
+
+
+def _key_row(job: BenchmarkJob) -> Dict[str, Any]:
+    return {
+        "hardware": job.hardware,
+        "benchmark_level": job.benchmark_level,
+        "algorithm": job.algorithm,
+        "qubits": job.qubits,
+        "compiler": job.compiler,
+        "opt_level": job.opt_level,
+        "run": job.run,
+    }
+
+
+def failed_row(job: BenchmarkJob, status: str, compile_time: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Returns the result row of a job that produced no result, e.g. because it was killed or never started.
+
+    Args:
+        job: The job.
+        status: Status of the run, e.g. 'timeout', 'oom', 'skipped' or 'cancelled'.
+        compile_time: Time the job used before it was stopped.
+    """
+    row = _key_row(job)
+    row.update({"compile_time": compile_time, "success": False, "status": status})
+    return row
+
+
+def _store_artifact(compiled_qasm_path: str, job: BenchmarkJob, compiler: CompilerAdapter,
+                    hardware: HardwareModel) -> Optional[str]:
+    """Moves a compiled circuit into the artifact store and returns its content hash, or None if that failed."""
+    try:
+        key = artifact_key(job.qasm_path, job.compiler, compiler.version, {
+            "hardware": hardware.fingerprint(),
+            "opt_level": job.opt_level,
+            "active_phases": job.active_phases,
+            "seed": job.seed,
+        })
+        content_hash = ArtifactStore(job.artifact_dir).put(compiled_qasm_path, key)
+        os.remove(compiled_qasm_path)
+        return content_hash
+    except Exception as e:
+        print(f"Could not store compiled circuit {compiled_qasm_path}: {e}")
+        return None
+
+
+def _stage_for_verification(compiled_qasm_path: str, job: BenchmarkJob) -> str:
+    directory = os.path.join(os.path.dirname(compiled_qasm_path), "verification")
+    os.makedirs(directory, exist_ok=True)
+    _, file = os.path.split(compiled_qasm_path.removesuffix(".qasm"))
+    filename = os.path.join(directory, f"{file}_run{job.run}_{os.getpid()}_{time.time_ns()}.qasm")
+    shutil.copyfile(compiled_qasm_path, filename)
+    return filename
+
+
+def input_metrics(qasm_path: str) -> Dict[str, int]:
+    """Returns the QASM engine metrics of an input circuit, computed once per process."""
+    if qasm_path not in _input_metrics:
+        _input_metrics[qasm_path] = compute_metrics(qasm_path)
+    return _input_metrics[qasm_path]
+
+
+def trivial_layout_swap_estimate(hardware: HardwareModel, qasm_path: str) -> Optional[int]:
+    """
+    Returns the SWAP lower bound of an input circuit under the trivial layout, computed once per process.
+
+    The trivial layout places input qubit i on physical qubit i, which for MAPPED circuits is the layout
+    chosen by MQT Bench. The value only bounds routers that keep this layout. Compilers choose their own
+    initial layout and regularly need fewer SWAPs (e.g. none for GHZ on a line), so it is an estimate
+    of how hard the input is to route, not a bound on the compiled results.
+
+    Args:
+        hardware: The target hardware model.
+        qasm_path: Path to the input QASM file.
+
+    Returns:
+        The estimate (see HardwareModel.swap_lower_bound) or None if the circuit cannot be analysed.
+    """
+    key = (hardware.name, qasm_path)
+    if key not in _swap_estimates:
+        try:
+            _swap_estimates[key] = hardware.swap_lower_bound(interaction_pairs(qasm_path))
+        except Exception as e:
+            print(f"Could not compute the SWAP estimate of {qasm_path}: {e}")
+            _swap_estimates[key] = None
+    return _swap_estimates[key]
+
+
+def compliance_violation(hardware: HardwareModel, qasm_path: str) -> Optional[str]:
+    """
+    Checks that a compiled circuit respects the qubit count and coupling graph of the hardware.
+
+    The gate names are not checked: the QASM exports of Cirq and Pytket write single-qubit gates as u3,
+    whatever their native gate set.
+
+    Args:
+        hardware: The target hardware model.
+        qasm_path: Path to the compiled QASM file.
+
+    Returns:
+        Description of the first violation (see HardwareModel.connectivity_violation), or None if compliant.
+    """
+    try:
+        labels = qubit_labels(qasm_path)
+        operations = ((op.name, tuple(labels[q] for q in op.qubits) if labels else op.qubits)
+                      for op in iter_operations(qasm_path))
+        return hardware.connectivity_violation(operations)
+    except Exception as e:
+        return f"could not be analysed: {e}"
+
+
+def preload_modules(jobs: List[BenchmarkJob]) -> List[str]:
+    """Returns the modules worker processes need for the jobs, including only the adapters of the used compilers."""
+    return ["quantum_bench.executor"] + sorted({get_adapter_module(job.compiler) for job in jobs})
+
+
+def _init_worker(hardware_models: Dict[str, HardwareModel]):
+    _worker_hardware.update(hardware_models)
+
+
+def _execute_worker_jobs(jobs: List[BenchmarkJob]) -> List[Dict[str, Any]]:
+    return [execute_job(job, _worker_hardware[job.hardware]) for job in jobs]
+
+
+def _batch_jobs(jobs: List[BenchmarkJob], num_workers: int) -> List[List[BenchmarkJob]]:
+    """
+    Splits the jobs into consecutive batches sharing input circuit and compiler.
+
+    A batch runs in a single worker, so the adapter parses its input only once. Large groups are split up
+    so that all workers stay busy.
+    """
+    max_batch_size = max(1, math.ceil(len(jobs) / num_workers))
+    batches = []
+    for _, group in itertools.groupby(jobs, key=lambda job: (job.hardware, job.qasm_path, job.compiler)):
+        group = list(group)
+        batches.extend(group[i:i + max_batch_size] for i in range(0, len(group), max_batch_size))
+    return batches
+
+
+def iter_results(jobs: List[BenchmarkJob], hardware_models: Dict[str, HardwareModel],
+                 num_workers: Optional[int] = 1, job_timeout: Optional[float] = None,
+                 memory_limit_mb: Optional[float] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Executes the jobs and yields their result rows.
+
+    If a time or memory budget is given, every job runs in its own child process instead
+    (see _iter_isolated_results) and the rows are yielded in completion order.
+
+    Args:
+        jobs: Jobs to execute.
+        hardware_models: Hardware models referenced by the jobs, keyed by name.
+        num_workers: Number of worker processes. 1 executes the jobs in-process,
+                     None uses all available cores.
+        job_timeout: Wall-clock budget in seconds per job.
+        memory_limit_mb: Resident set size budget in MB per job.
+
+    Yields:
+        One result row per job, including the jobs skipped after a budget was exceeded. Without budgets in the
+        same order as the jobs.
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    if job_timeout is not None or memory_limit_mb is not None:
+        yield from _iter_isolated_results(jobs, hardware_models, num_workers, job_timeout, memory_limit_mb)
+        return
+
+    if num_workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield execute_job(job, hardware_models[job.hardware])
+        return
+
+    context = get_context(preload_modules(jobs))
+    with ProcessPoolExecutor(max_workers=num_workers, mp_context=context,
+                             initializer=_init_worker, initargs=(hardware_models,)) as pool:
+        for rows in pool.map(_execute_worker_jobs, _batch_jobs(jobs, num_workers)):
+            yield from rows
+
+
+def _iter_isolated_results(jobs: List[BenchmarkJob], hardware_models: Dict[str, HardwareModel], num_workers: int,
+                           job_timeout: Optional[float], memory_limit_mb: Optional[float]) -> Iterator[Dict[str, Any]]:
+    """
+    Executes every job in its own child process, which is killed once it exceeds the time or memory budget.
+
+    A killed job is recorded with status 'timeout' or 'oom' and the time it used as compile_time.
+    Afterwards, jobs of the same hardware, benchmark level, algorithm and compiler with more qubits are not
+    executed, as they would exceed the budget as well. They are recorded with status 'skipped', so a resumed
+    benchmark does not run them again.
+    Adapters cannot be reused across jobs, their hardware artifacts are loaded from the disk cache instead.
+    """
+    # Smallest qubit count that exceeded a budget, keyed by (hardware, benchmark level, algorithm, compiler).
+    exceeded: Dict[Tuple[str, str, str, str], int] = {}
+    queued = deque(enumerate(jobs))
+    running: Dict[int, BenchmarkJob] = {}
+
+    with IsolatedPool(num_workers, preload=preload_modules(jobs)) as pool:
+        while queued or running:
+            while queued and len(running) < num_workers:
+                index, job = queued.popleft()
+                limit = exceeded.get((job.hardware, job.benchmark_level, job.algorithm, job.compiler))
+                if limit is not None and job.qubits > limit:
+                    print(f"Skipping {job.compiler} on {job.algorithm} ({job.qubits} Qubits), "
+                          f"{limit} qubits already exceeded the budget.")
+                    yield failed_row(job, "skipped")
+                    continue
+                pool.submit(index, execute_job, job, hardware_models[job.hardware],
+                            timeout=job_timeout, memory_limit_mb=memory_limit_mb)
+                running[index] = job
+
+            if not running:
+                continue
+
+            result = pool.next_result()
+            job = running.pop(result.key)
+            if result.status == "ok":
+                yield result.value
+                continue
+
+            if result.status in ("timeout", "oom"):
+                group = (job.hardware, job.benchmark_level, job.algorithm, job.compiler)
+                exceeded[group] = min(exceeded.get(group, job.qubits), job.qubits)
+                print(f"{job.compiler} on {job.algorithm} ({job.qubits} Qubits) exceeded the budget: {result.status}")
+            else:
+                print(f"Error during compilation: {result.value}")
+
+            yield failed_row(job, result.status, result.elapsed)
@@ -1,22 +1,189 @@
-from dataclasses import dataclass
-from typing import List, Tuple, Optional
+import hashlib
+import json
+import math
+import os
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Tuple, Optional, Dict, Iterable, Sequence
+
+import numpy as np
+
+# Arrays derived from the coupling map, see HardwareModel.share_topology.
+TOPOLOGY_ARRAYS = ["indptr", "indices", "degrees", "distances"]
 
 
 @dataclass
 class HardwareModel:
     """
     Represents a quantum hardware model including its topology and basis gates.
+
+    The undirected coupling graph is additionally available as NumPy arrays (CSR adjacency, degrees and
+    all-pairs shortest path distances), which are computed lazily on first access.
     """
     name: str
     num_qubits: int
     edges: List[Tuple[int, int]]
     basis_gates: List[str]
+    _arrays: Dict[str, np.ndarray] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _topology_dir: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def coupling_map(self) -> List[Tuple[int, int]]:
         """Returns the coupling map as a list of tuples."""
         return self.edges
 
+    def fingerprint(self) -> str:
+        """Returns a hash of topology and basis gates, identifying artifacts derived from this model."""
+        content = json.dumps([self.name, self.num_qubits, sorted(map(list, self.edges)), sorted(self.basis_gates)])
+        return hashlib.sha256(content.encode()).hexdigest()
+
+    @property
+    def adjacency(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns the undirected coupling graph in CSR format as (indptr, indices)."""
+        return self._array("indptr"), self._array("indices")
+
+    @property
+    def degrees(self) -> np.ndarray:
+        """Returns the number of neighbours of every physical qubit."""
+        return self._array("degrees")
+
+    @property
+    def distance_matrix(self) -> np.ndarray:
+        """Returns the all-pairs shortest path lengths in edges. Unreachable pairs are -1."""
+        return self._array("distances")
+
+    @property
+    def diameter(self) -> int:
+        """Returns the largest finite distance between two physical qubits."""
+        return int(self.distance_matrix.max(initial=0))
+
+    def share_topology(self, directory: str):
+        """
+        Stores the topology arrays as .npy files and memory-maps them.
+
+        Pickled copies of the model (e.g. sent to worker processes) then no longer carry the arrays
+        but map the same files read-only.
+
+        Args:
+            directory: Directory for the array files.
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name in TOPOLOGY_ARRAYS:
+            filename = os.path.join(directory, f"{name}.npy")
+            if not os.path.exists(filename):
+                tmp_filename = f"{filename}.{os.getpid()}.tmp.npy"
+                np.save(tmp_filename, self._array(name))
+                os.replace(tmp_filename, filename)
+        self._topology_dir = directory
+        self._arrays = {}
+
+    def swap_lower_bound(self, interactions: Iterable[Tuple[int, int]], layout: Optional[Sequence[int]] = None) -> int:
+        """
+        Returns a lower bound on the SWAP gates needed to execute the 2-qubit interactions of a circuit.
+
+        Every interacting pair must become adjacent at some point. A SWAP moves two qubits by one edge,
+        so a single pair at distance d needs at least d - 1 SWAPs, and a set of disjoint pairs needs at least
+        half of the sum of their d - 1. The bound holds for any gate order and needs no routing,
+        but only for the given initial layout. A router choosing another layout may need fewer SWAPs.
+
+        Args:
+            interactions: Pairs of logical qubits interacting in the circuit.
+            layout: Physical qubit of every logical qubit. Defaults to the trivial layout.
+
+        Returns:
+            The lower bound on the number of SWAP gates.
+        """
+        pairs = np.array(sorted({tuple(sorted(pair)) for pair in interactions}), dtype=np.int64).reshape(-1, 2)
+        if not len(pairs):
+            return 0
+
+        physical = np.asarray(layout if layout is not None else np.arange(self.num_qubits), dtype=np.int64)
+        excess = self.distance_matrix[physical[pairs[:, 0]], physical[pairs[:, 1]]].astype(np.int64) - 1
+        reachable = excess >= 0
+        pairs, excess = pairs[reachable], excess[reachable]
+        if not len(pairs):
+            return 0
+
+        # Greedy matching of disjoint pairs, most distant pairs first.
+        used = set()
+        matched_excess = 0
+        for index in np.argsort(-excess, kind="stable"):
+            a, b = pairs[index]
+            if excess[index] == 0:
+                break
+            if a not in used and b not in used:
+                used.update((a, b))
+                matched_excess += int(excess[index])
+
+        return max(int(excess.max()), math.ceil(matched_excess / 2))
+
+    def connectivity_violation(self, operations: Iterable[Tuple[str, Tuple[int, ...]]]) -> Optional[str]:
+        """
+        Checks that a circuit on physical qubits can be executed on the coupling graph.
+
+        Every qubit must exist and every multi-qubit operation except barriers must act on two coupled qubits.
+        The direction of an edge is ignored, as every compiler reverses CX gates for free.
+
+        Args:
+            operations: (name, physical qubits) of every operation of the circuit.
+
+        Returns:
+            Description of the first violation, or None if the circuit is executable.
+        """
+        distances = self.distance_matrix
+        for name, qubits in operations:
+            if name == "barrier":
+                continue
+            for qubit in qubits:
+                if not 0 <= qubit < self.num_qubits:
+                    return f"{name} on qubit {qubit}, which {self.name} does not have"
+            if len(qubits) > 2:
+                return f"{len(qubits)}-qubit operation {name} on {tuple(qubits)}"
+            if len(qubits) == 2 and distances[qubits[0], qubits[1]] != 1:
+                return f"{name} on uncoupled qubits {tuple(qubits)}"
+        return None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self._topology_dir:
+            state["_arrays"] = {}
+        return state
+
+    def _array(self, name: str) -> np.ndarray:
+        if name not in self._arrays:
+            filename = os.path.join(self._topology_dir, f"{name}.npy") if self._topology_dir else None
+            if filename and os.path.exists(filename):
+                self._arrays[name] = np.load(filename, mmap_mode="r")
+            else:
+                self._arrays.update(self._compute_topology())
+        return self._arrays[name]
+
+    def _compute_topology(self) -> Dict[str, np.ndarray]:
+        n = self.num_qubits
+        edges = np.array(self.edges, dtype=np.int64).reshape(-1, 2)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        edges = np.unique(np.concatenate([edges, edges[:, ::-1]]), axis=0)
+
+        degrees = np.bincount(edges[:, 0], minlength=n).astype(np.int32)
+        indptr = np.concatenate([[0], np.cumsum(degrees)]).astype(np.int32)
+        indices = edges[:, 1].astype(np.int32)
+
+        neighbours = [indices[indptr[q]:indptr[q + 1]].tolist() for q in range(n)]
+        distances = np.full((n, n), -1, dtype=np.int32)
+        for source in range(n):
+            row = [-1] * n
+            row[source] = 0
+            queue = deque([source])
+            while queue:
+                qubit = queue.popleft()
+                for neighbour in neighbours[qubit]:
+                    if row[neighbour] < 0:
+                        row[neighbour] = row[qubit] + 1
+                        queue.append(neighbour)
+            distances[source] = row
+
+        return {"indptr": indptr, "indices": indices, "degrees": degrees, "distances": distances}
+
 
 def get_hardware(hardware_name: str) -> Optional[HardwareModel]:
     """
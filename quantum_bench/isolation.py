@@ -0,0 +1,206 @@
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from multiprocessing.connection import wait
+from typing import Any, Callable, Optional, List, Iterator, Tuple, Dict
+
+
+@dataclass
+class IsolatedResult:
+    """Outcome of a task executed in its own child process."""
+    key: Any
+    status: str  # "ok", "error", "timeout" or "oom"
+    value: Any
+    elapsed: float
+
+
+@dataclass
+class _Task:
+    key: Any
+    fn: Callable
+    args: Tuple
+    timeout: Optional[float]
+    memory_limit_mb: Optional[float]
+
+
+# Interval in seconds at which the monitor thread starts queued tasks and checks the limits of running ones.
+POLL_INTERVAL = 0.1
+
+# Modules preloaded by the fork server, shared by all pools of this process.
+_preload: List[str] = []
+
+
+def _run_child(conn, fn: Callable, args: Tuple):
+    try:
+        conn.send(("ok", fn(*args)))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def get_context(preload: Optional[List[str]] = None):
+    """
+    Returns the multiprocessing context for worker processes.
+
+    Workers are forked from a fork server if available, otherwise spawned. Forking the benchmark process
+    itself is unsafe once it runs threads (e.g. a pool's monitor thread or a compiler's thread pool).
+
+    Args:
+        preload: Modules imported once by the fork server, so workers start without import cost.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # There is only one fork server, so the preload lists of all pools are combined.
+        _preload.extend(module for module in preload or [] if module not in _preload)
+        if _preload:
+            context.set_forkserver_preload(_preload)
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _rss_mb(pid: int) -> float:
+    """Returns the resident set size of a process in MB, or 0 if it cannot be determined (e.g. without /proc)."""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return 0.0
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+class IsolatedPool:
+    """
+    Runs every task in a fresh child process, at most max_workers at a time.
+
+    Unlike a ProcessPoolExecutor, a task that exceeds its timeout or memory limit is killed, so a hanging or
+    exploding task never blocks the pool or takes down the caller. A monitor thread starts queued tasks and
+    enforces deadlines, so tasks make progress while the caller is busy with other work.
+    Task functions and arguments must be picklable.
+    """
+
+    def __init__(self, max_workers: int = 1, preload: Optional[List[str]] = None):
+        """
+        Initializes the pool.
+
+        Args:
+            max_workers: Maximum number of concurrently running child processes.
+            preload: Modules imported once by the fork server, so children start without import cost.
+        """
+        self.max_workers = max(1, max_workers)
+        self._context = get_context(preload)
+        self._pending: deque = deque()
+        self._running: Dict[Any, Tuple[_Task, Any, float]] = {}
+        self._results: "queue.Queue[IsolatedResult]" = queue.Queue()
+        self._unfinished = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._monitor, daemon=True)
+        self._thread.start()
+
+    def submit(self, key: Any, fn: Callable, *args, timeout: Optional[float] = None,
+               memory_limit_mb: Optional[float] = None):
+        """
+        Queues a task.
+
+        Args:
+            key: Identifier returned with the task's result.
+            fn: Module-level function to execute.
+            *args: Arguments of the function.
+            timeout: Wall-clock limit in seconds after which the child is killed. None means no limit.
+            memory_limit_mb: Resident set size in MB above which the child is killed. None means no limit.
+                             The RSS includes pages shared with the fork server (e.g. preloaded modules) and is
+                             sampled every POLL_INTERVAL seconds, so short peaks may pass unnoticed.
+        """
+        with self._condition:
+            self._pending.append(_Task(key, fn, args, timeout, memory_limit_mb))
+            self._unfinished += 1
+            self._condition.notify()
+
+    def results(self) -> List[IsolatedResult]:
+        """Returns the results of all tasks finished since the last call, without blocking."""
+        results = []
+        while True:
+            try:
+                results.append(self._results.get_nowait())
+            except queue.Empty:
+                return results
+
+    def next_result(self) -> IsolatedResult:
+        """Waits for the next finished task and returns its result. Must only be called while tasks are unfinished."""
+        return self._results.get()
+
+    def wait_all(self) -> Iterator[IsolatedResult]:
+        """Yields the results of all remaining tasks as they finish."""
+        while True:
+            with self._condition:
+                if self._unfinished == 0 and self._results.empty():
+                    return
+            yield self.next_result()
+
+    def shutdown(self):
+        """Kills all running tasks, discards queued ones and stops the monitor thread."""
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+    def _monitor(self):
+        while True:
+            with self._condition:
+                while not self._closed and not self._running and not self._pending:
+                    self._condition.wait()
+                if self._closed:
+                    break
+                while self._pending and len(self._running) < self.max_workers:
+                    self._start(self._pending.popleft())
+                connections = list(self._running)
+
+            now = time.perf_counter()
+            deadlines = [start + task.timeout - now for task, _, start in self._running.values() if task.timeout]
+            ready = wait(connections, timeout=min(max(min(deadlines, default=POLL_INTERVAL), 0.0), POLL_INTERVAL))
+
+            with self._condition:
+                for conn in ready:
+                    self._finish(conn)
+                now = time.perf_counter()
+                for conn, (task, process, start) in list(self._running.items()):
+                    if task.timeout and now - start > task.timeout:
+                        self._finish(conn, status="timeout")
+                    elif task.memory_limit_mb and _rss_mb(process.pid) > task.memory_limit_mb:
+                        self._finish(conn, status="oom")
+
+        for conn in list(self._running):
+            self._finish(conn, status="timeout")
+
+    def _start(self, task: _Task):
+        parent_conn, child_conn = self._context.Pipe(duplex=False)
+        process = self._context.Process(target=_run_child, args=(child_conn, task.fn, task.args), daemon=True)
+        process.start()
+        child_conn.close()
+        self._running[parent_conn] = (task, process, time.perf_counter())
+
+    def _finish(self, conn, status: Optional[str] = None):
+        task, process, start = self._running.pop(conn)
+        value = None
+        if status is None:
+            try:
+                status, value = conn.recv()
+            except EOFError:
+                status, value = "error", f"Process exited with code {process.exitcode}"
+        process.kill()
+        process.join()
+        conn.close()
+        self._results.put(IsolatedResult(task.key, status, value, time.perf_counter() - start))
+        self._unfinished -= 1
@@ -0,0 +1,194 @@
+import os
+from dataclasses import dataclass
+from math import comb
+from typing import List, Optional, Dict, Any
+
+import numpy as np
+import pandas as pd
+
+import quantum_bench.data.mqt_provider as mqt
+from quantum_bench.compilers.registry import available_compilers, get_adapter_class
+from quantum_bench.executor import BenchmarkJob, iter_results
+from quantum_bench.hardware.model import HardwareModel
+from quantum_bench.results import open_result_writer, remove_results
+
+# Metrics a seed can be selected by, lower is better.
+OBJECTIVES = ["swap_gates", "depth", "2q_gates", "gate_count"]
+
+
+@dataclass
+class SeedSweep:
+    """The compiler runs of one configuration with different seeds."""
+    rows: List[Dict[str, Any]]
+    objective: str
+
+    @property
+    def successful(self) -> List[Dict[str, Any]]:
+        return [row for row in self.rows if row.get("success") and row.get(self.objective) is not None]
+
+    @property
+    def best(self) -> Optional[Dict[str, Any]]:
+        """The row with the lowest objective, the earliest seed on ties."""
+        rows = self.successful
+        return min(rows, key=lambda row: row[self.objective]) if rows else None
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns the distribution of the objective over the seeds and the expected best of k seeds."""
+        values = np.array([row[self.objective] for row in self.successful], dtype=float)
+        best = self.best
+        summary = {
+            "objective": self.objective,
+            "seeds": len(self.rows),
+            "successful_seeds": len(values),
+            "best_seed": best["seed"] if best else None,
+            "best_artifact": best.get("artifact") if best else None,
+            "min": float(values.min()) if len(values) else None,
+            "median": float(np.median(values)) if len(values) else None,
+            "mean": float(values.mean()) if len(values) else None,
+            "std": float(values.std(ddof=1)) if len(values) > 1 else None,
+            "max": float(values.max()) if len(values) else None,
+            "total_compile_time": sum(row.get("compile_time") or 0.0 for row in self.rows),
+        }
+        k = 1
+        while k <= len(values):
+            summary[f"best_of_{k}"] = expected_best_of(values, k)
+            k *= 2
+        return summary
+
+
+def expected_best_of(values: np.ndarray, k: int) -> float:
+    """
+    Returns the expected minimum of k seeds drawn without replacement from the observed values.
+
+    This is the quality to expect when spending k compiler runs (e.g. k cores) instead of one.
+    """
+    values = np.sort(values)
+    n = len(values)
+    # The i-th smallest value (0-based) is the minimum if it is drawn and the other k-1 seeds are larger.
+    weights = np.array([comb(n - i - 1, k - 1) for i in range(n)], dtype=float) / comb(n, k)
+    return float(weights @ values)
+
+
+def best_of_seeds(hardware: HardwareModel, compiler: str, qasm_file: str, opt_level: int = 3, num_seeds: int = 8,
+                  objective: str = "swap_gates", active_phases: Optional[List[str]] = None,
+                  first_seed: int = 0, num_workers: Optional[int] = None, benchmark_level: str = "",
+                  algorithm: str = "", qubits: int = 0) -> SeedSweep:
+    """
+    Compiles a circuit with num_seeds different seeds in parallel and selects the best result.
+
+    The rebase does not depend on the seed. It is computed once and saved as a checkpoint, so every seed only
+    repeats the phases after it (see CompilerAdapter.run_steps). The compiled circuits of all seeds are kept in
+    the artifact store and referenced by their rows, so the best one can be retrieved.
+    Only compilers whose mapping uses the seed (Qiskit's SabreLayout/SabreSwap) produce a distribution.
+    Compilers without CompilerAdapter.uses_seed (Cirq's RouteCQC, Pytket's LexiRoute) are compiled with
+    first_seed only, as every other seed would repeat the same compile.
+
+    Args:
+        hardware: The target hardware model.
+        compiler: Name of the compiler.
+        qasm_file: Path to the input QASM file.
+        opt_level: Optimization level.
+        num_seeds: Number of seeds. Ignored for compilers that do not use the seed.
+        objective: Metric to minimize, one of OBJECTIVES.
+        active_phases: Phases to execute. Defaults to rebase and mapping, as a final optimization
+                       (e.g. Qiskit's basis translation) removes the SWAP gates the objective counts.
+        first_seed: The seeds are first_seed, first_seed + 1, ...
+        num_workers: Number of worker processes, None uses all available cores.
+        benchmark_level: Benchmark level recorded in the rows.
+        algorithm: Algorithm recorded in the rows.
+        qubits: Qubit count recorded in the rows.
+
+    Returns:
+        The runs of all seeds.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}. Available: {OBJECTIVES}")
+    if not get_adapter_class(compiler).uses_seed:
+        num_seeds = 1
+    active_phases = active_phases or ["rebase", "mapping"]
+    resume_from = "rebase" if "rebase" in active_phases else None
+
+    jobs = [
+        BenchmarkJob(hardware=hardware.name, benchmark_level=benchmark_level, algorithm=algorithm, qubits=qubits,
+                     compiler=compiler, opt_level=opt_level, run=i, qasm_path=qasm_file,
+                     active_phases=active_phases, seed=first_seed + i, resume_from=resume_from)
+        for i in range(num_seeds)
+    ]
+    hardware_models = {hardware.name: hardware}
+    # The first seed runs alone and saves the checkpoint the others start from.
+    rows = list(iter_results(jobs[:1], hardware_models, 1))
+    rows.extend(iter_results(jobs[1:], hardware_models, num_workers))
+    for job, row in zip(jobs, rows):
+        row["seed"] = job.seed
+    return SeedSweep(rows, objective)
+
+
+def run_multiseed_benchmark(hardware_names: List[str], algo_names: List[str], qubit_ranges: List[int],
+                            benchmark_level: str = "INDEP", opt_levels: Optional[List[int]] = None,
+                            compilers: Optional[List[str]] = None, num_seeds: int = 8,
+                            objective: str = "swap_gates", active_phases: Optional[List[str]] = None,
+                            num_workers: Optional[int] = None,
+                            output_file: str = "multiseed_results.csv") -> pd.DataFrame:
+    """
+    Runs best_of_seeds for every configuration.
+
+    Every seed is recorded as its own run (run i has seed i), so the result file holds the full distribution.
+    The per-configuration summary with the best seed and the expected best of 1, 2, 4, ... seeds is written
+    to '<output>_seeds.csv'.
+
+    Args:
+        hardware_names: List of hardware names to benchmark against.
+        algo_names: List of algorithm names to benchmark.
+        qubit_ranges: Qubit counts to test.
+        benchmark_level: Benchmark level of the input circuits.
+        opt_levels: Optimization levels to test. Defaults to [3].
+        compilers: Names of the compilers to benchmark. Defaults to all registered compilers that use the seed.
+        num_seeds: Number of seeds per configuration. Compilers that do not use the seed run once.
+        objective: Metric to minimize, one of OBJECTIVES.
+        active_phases: Phases to execute (see best_of_seeds).
+        num_workers: Number of worker processes running the seeds, None uses all available cores.
+        output_file: Path to the result file.
+
+    Returns:
+        The summary table, one row per configuration.
+    """
+    opt_levels = opt_levels or [3]
+    compilers = compilers or [name for name in available_compilers() if get_adapter_class(name).uses_seed]
+    remove_results(output_file)
+
+    summaries = []
+    with open_result_writer(output_file) as writer:
+        for hardware_name in hardware_names:
+            hardware = mqt.get_hardware_model(hardware_name)
+            if not hardware:
+                print(f"Skipping unknown hardware: {hardware_name}")
+                continue
+            for algo_name in algo_names:
+                for n_qubits in qubit_ranges:
+                    if n_qubits > hardware.num_qubits:
+                        continue
+                    qasm_path = mqt.get_circuit(hardware_name, algo_name, n_qubits, benchmark_level)
+                    if not qasm_path:
+                        continue
+                    for compiler_name in compilers:
+                        for opt_level in opt_levels:
+                            seeds = num_seeds if get_adapter_class(compiler_name).uses_seed else 1
+                            print(f"--- {compiler_name} opt{opt_level}: {algo_name} ({n_qubits} Qubits), "
+                                  f"{seeds} seed(s) ---")
+                            sweep = best_of_seeds(hardware, compiler_name, qasm_path, opt_level, num_seeds,
+                                                  objective, active_phases, num_workers=num_workers,
+                                                  benchmark_level=benchmark_level, algorithm=algo_name,
+                                                  qubits=n_qubits)
+                            for row in sweep.rows:
+                                writer.write(row)
+                            summary = {"hardware": hardware_name, "benchmark_level": benchmark_level,
+                                       "algorithm": algo_name, "qubits": n_qubits, "compiler": compiler_name,
+                                       "opt_level": opt_level, **sweep.summary()}
+                            print(summary)
+                            summaries.append(summary)
+
+    summary_table = pd.DataFrame(summaries)
+    seeds_file = f"{os.path.splitext(output_file.rstrip(os.sep))[0]}_seeds.csv"
+    summary_table.to_csv(seeds_file, index=False)
+    print(f"Multi-seed benchmark finished. Results saved to {output_file}, best seeds to {seeds_file}.")
+    return summary_table
@@ -1,18 +1,54 @@
+import hashlib
+import itertools
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, List, Dict, Any
+
+import matplotlib
+matplotlib.use("Agg")
 import matplotlib.pyplot as plt
 import pandas as pd
 import seaborn as sns
 
+from quantum_bench.aggregate import load_summary
+from quantum_bench.compilers.base import COMPILE_PHASES, PHASES
+from quantum_bench.isolation import get_context
+from quantum_bench.results import read_results, result_columns
+
+# File in the output directory recording the content hash of every rendered plot.
+PLOT_INDEX_FILE = "plot_index.json"
+
+# Part of every content hash, so changes to the plot layout invalidate all existing plots.
+PLOT_VERSION = 2
+
 class BenchmarkPlotter:
     """Class to handle plotting of benchmark results."""
 
-    def __init__(self, csv_file_path: str, output_dir: str = "visualisation"):
+    def __init__(self, csv_file_path: str, output_dir: str = "visualisation", num_workers: Optional[int] = None):
+        """
+        Initializes the plotter.
+
+        Args:
+            csv_file_path: Path to the result file (CSV or Parquet).
+            output_dir: Directory for the plots.
+            num_workers: Number of processes rendering plots. None uses all available cores.
+        """
         self.csv_file_path = csv_file_path
         self.output_dir = output_dir
+        self.num_workers = num_workers or os.cpu_count() or 1
         self.df = None
-        self.metrics = ["compile_time", "gate_count", "depth", "2q_gates", "swap_gates"]
+        self.time_metrics = ["compile_time", "compile_cpu_time"] + [f"{p}_{kind}" for p in PHASES for kind in ["time", "cpu_time"]]
+        self.memory_metrics = [f"{p}_peak_{kind}_mb" for kind in ["rss", "traced"] for p in ["compile"] + COMPILE_PHASES]
+        self.metrics = (["compile_time", "gate_count", "depth", "2q_gates", "swap_gates"] + self.time_metrics[1:]
+                        + self.memory_metrics)
         self.metric_labels = {
             "compile_time": "Compilation Time (s)",
+            "compile_cpu_time": "Compilation CPU Time (s)",
+            **{f"{p}_time": f"{p.capitalize()} Time (s)" for p in PHASES},
+            **{f"{p}_cpu_time": f"{p.capitalize()} CPU Time (s)" for p in PHASES},
+            **{f"{p}_peak_rss_mb": f"{p.capitalize()} Peak RSS Increase (MB)" for p in ["compile"] + COMPILE_PHASES},
+            **{f"{p}_peak_traced_mb": f"{p.capitalize()} Peak Python Allocations (MB)" for p in ["compile"] + COMPILE_PHASES},
             "gate_count": "Total Gate Count",
             "depth": "Circuit Depth",
             "2q_gates": "Number of 2-Qubit Gates",
@@ -26,51 +62,23 @@ class BenchmarkPlotter:
         }
 
     def load_data(self) -> bool:
-        """Loads data from the CSV file."""
+        """Loads data from the result file (CSV or Parquet)."""
         if not os.path.exists(self.csv_file_path):
             print(f"Error: File '{self.csv_file_path}' not found.")
             return False
         
-        self.df = pd.read_csv(self.csv_file_path)
-        if "success" in self.df.columns:
-            self.df = self.df[self.df["success"] == True]
+        # Files without a 'success' column (e.g. from older versions) only contain successful runs.
+        filters = [("success", "==", True)] if "success" in result_columns(self.csv_file_path) else None
+        self.df = read_results(self.csv_file_path, filters=filters)
         
-        self.df.rename(columns=self.metric_labels, inplace=True)
         return not self.df.empty
 
-    def _generate_plot(self, data, x_col, y_col, hue_col, style_col, title, output_path):
-        plt.figure(figsize=(12, 7))
-        sns.set_theme(style="whitegrid")
-        
-        if data.empty:
-            return
-
-        try:
-            sns.lineplot(
-                data=data, x=x_col, y=y_col, hue=hue_col, style=style_col,
-                markers=True, dashes=False, linewidth=2, markersize=8, errorbar=('ci', 95)
-            )
-            
-            if y_col == self.metric_labels.get("compile_time", "compile_time"):
-                plt.yscale("log")
-
-            plt.title(title)
-            plt.xlabel(x_col)
-            plt.ylabel(y_col)
-            plt.legend(bbox_to_anchor=(1.02, 1), loc='upper left', borderaxespad=0)
-            plt.tight_layout()
-            
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            plt.savefig(output_path)
-            print(f"Generated: {output_path}")
-        except Exception as e:
-            print(f"Failed to generate plot {output_path}: {e}")
-        finally:
-             plt.close()
-
     def run_plot_config(self, category_name, group_cols, line_cols, x_col="qubits"):
         """
         Generates plots based on configuration.
+
+        The plots show the mean and its bootstrap CI from the summary table of the viewed dimensions
+        (see quantum_bench.aggregate), which is computed once and shared by all plots and metrics of a view.
         
         Args:
             category_name: Sub folder name.
@@ -79,20 +87,22 @@ class BenchmarkPlotter:
             x_col: Column for x-axis.
         """
         print(f"--- Processing {category_name} ---")
-        
-        real_group_cols = [self.metric_labels.get(c, c) for c in group_cols]
-        real_line_cols = [self.metric_labels.get(c, c) for c in line_cols]
-        real_x_col = self.metric_labels.get(x_col, x_col)
 
-        if len(real_line_cols) == 1:
-            real_line_cols = [real_line_cols[0], real_line_cols[0]]
+        if len(line_cols) == 1:
+            line_cols = [line_cols[0], line_cols[0]]
+        dims = list(dict.fromkeys(group_cols + line_cols + [x_col]))
+        summary = load_summary(self.csv_file_path, dims, df=self.df)
+        real_group_cols = [self.metric_labels.get(c, c) for c in group_cols]
 
+        tasks = []
         for metric in self.metrics:
-            real_metric = self.metric_labels.get(metric, metric)
-            if real_metric not in self.df.columns:
+            metric_summary = summary[summary["metric"] == metric]
+            if metric_summary.empty:
                 continue
 
-            for name, group_data in self.df.groupby(real_group_cols):
+            real_metric = self.metric_labels.get(metric, metric)
+            columns = list(dict.fromkeys([x_col] + line_cols)) + ["mean", "ci_low", "ci_high"]
+            for name, group_data in metric_summary.groupby(group_cols):
                 if not isinstance(name, tuple):
                     name = (name,)
 
@@ -100,21 +110,107 @@ class BenchmarkPlotter:
                 title = f"{category_name}\n{group_desc}\n{real_metric}"
                 filename = group_desc.replace(": ", "-").replace(" ", "_")
                 directory = category_name.replace(": ", "-").replace(" ", "_")
-                
+
                 output_path = os.path.join(self.output_dir, directory, metric, f"{filename}.png")
-                self._generate_plot(
-                    data=group_data, x_col=real_x_col, y_col=real_metric,
-                    hue_col=real_line_cols[0], style_col=real_line_cols[1],
-                    title=title, output_path=output_path
-                )
+                tasks.append({
+                    "data": group_data[columns], "x_col": x_col, "hue_col": line_cols[0], "style_col": line_cols[1],
+                    "labels": {c: self.metric_labels.get(c, c) for c in [x_col] + line_cols}, "y_label": real_metric,
+                    "title": title, "output_path": output_path, "log_scale": metric in self.time_metrics,
+                })
+
+        self._render(tasks)
+
+    def _render(self, tasks: List[Dict[str, Any]]):
+        """
+        Renders the plots whose data changed since they were last rendered.
+
+        Every plot is identified by a hash of its data and parameters, which is stored in the plot index
+        of the output directory. Plots with an unchanged hash and an existing file are skipped.
+        """
+        index_file = os.path.join(self.output_dir, PLOT_INDEX_FILE)
+        index = {}
+        if os.path.exists(index_file):
+            with open(index_file, "r") as f:
+                index = json.load(f)
+
+        hashes = {task["output_path"]: _content_hash(task) for task in tasks}
+        tasks = [task for task in tasks
+                 if index.get(task["output_path"]) != hashes[task["output_path"]] or not os.path.exists(task["output_path"])]
+        print(f"Rendering {len(tasks)} of {len(hashes)} plots, {len(hashes) - len(tasks)} unchanged.")
+
+        if self.num_workers <= 1 or len(tasks) <= 1:
+            rendered = [_generate_plot(**task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=self.num_workers, mp_context=get_context(["quantum_bench.plotter"])) as pool:
+                rendered = list(pool.map(_render_task, tasks, chunksize=max(1, len(tasks) // (4 * self.num_workers))))
+
+        index.update({path: hashes[path] for path in rendered if path})
+        os.makedirs(self.output_dir, exist_ok=True)
+        tmp_file = f"{index_file}.{os.getpid()}.tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(index, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, index_file)
+
+
+def _content_hash(task: Dict[str, Any]) -> str:
+    params = {key: value for key, value in task.items() if key != "data"}
+    digest = hashlib.sha256(json.dumps([PLOT_VERSION, params], sort_keys=True).encode())
+    digest.update(pd.util.hash_pandas_object(task["data"], index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def _render_task(task: Dict[str, Any]) -> Optional[str]:
+    return _generate_plot(**task)
+
+
+def _generate_plot(data, x_col, hue_col, style_col, labels, y_label, title, output_path, log_scale) -> Optional[str]:
+    """Renders the mean of every line with its CI band and returns the plot path, or None if it failed."""
+    if data.empty:
+        return None
+
+    plt.figure(figsize=(12, 7))
+    sns.set_theme(style="whitegrid")
+    try:
+        line_cols = list(dict.fromkeys([hue_col, style_col]))
+        hues = list(data[hue_col].drop_duplicates())
+        styles = list(data[style_col].drop_duplicates())
+        colors = dict(zip(hues, sns.color_palette(n_colors=len(hues))))
+        markers = dict(zip(styles, itertools.cycle(["o", "X", "s", "P", "D", "^", "v", "p"])))
+
+        for name, line in data.groupby(line_cols, sort=True):
+            values = dict(zip(line_cols, name if isinstance(name, tuple) else (name,)))
+            line = line.sort_values(x_col)
+            color = colors[values[hue_col]]
+            plt.plot(line[x_col], line["mean"], marker=markers[values[style_col]], color=color,
+                     linewidth=2, markersize=8, label=", ".join(str(v) for v in values.values()))
+            plt.fill_between(line[x_col], line["ci_low"], line["ci_high"], color=color, alpha=0.2)
+
+        if log_scale:
+            plt.yscale("log")
+
+        plt.title(title)
+        plt.xlabel(labels[x_col])
+        plt.ylabel(y_label)
+        plt.legend(title=", ".join(labels[c] for c in line_cols), bbox_to_anchor=(1.02, 1), loc='upper left', borderaxespad=0)
+        plt.tight_layout()
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        plt.savefig(output_path)
+        print(f"Generated: {output_path}")
+        return output_path
+    except Exception as e:
+        print(f"Failed to generate plot {output_path}: {e}")
+        return None
+    finally:
+        plt.close()
 
 def plot_results(csv_file_path="benchmark_results.csv", visualisation_path="visualisation",
-                 category_name="Compiler Benchmark", group_cols=None, line_cols=None):
+                 category_name="Compiler Benchmark", group_cols=None, line_cols=None, num_workers=None):
     if line_cols is None:
         line_cols = ["compiler", "opt_level"]
     if group_cols is None:
         group_cols = ["algorithm", "hardware", "benchmark_level"]
-    plotter = BenchmarkPlotter(csv_file_path, visualisation_path)
+    plotter = BenchmarkPlotter(csv_file_path, visualisation_path, num_workers)
     if plotter.load_data():
         plotter.run_plot_config(
             category_name=category_name,
@@ -124,8 +220,8 @@ def plot_results(csv_file_path="benchmark_results.csv", visualisation_path="visu
     else:
         print("Could not load data or data is empty.")
 
-def plot_mapping_benchmark(csv_file_path="mapping_results.csv", visualisation_path="visualisation"):
-    plotter = BenchmarkPlotter(csv_file_path, visualisation_path)
+def plot_mapping_benchmark(csv_file_path="mapping_results.csv", visualisation_path="visualisation", num_workers=None):
+    plotter = BenchmarkPlotter(csv_file_path, visualisation_path, num_workers)
     if plotter.load_data():
         plotter.run_plot_config("Mapping Only", ["hardware", "compiler", "opt_level"], ["benchmark_level"])
         plotter.run_plot_config("Mapping Only", ["benchmark_level", "compiler", "opt_level"], ["hardware"])
@@ -133,8 +229,8 @@ def plot_mapping_benchmark(csv_file_path="mapping_results.csv", visualisation_pa
     else:
         print("Could not load data or data is empty.")
 
-def plot_compilation_benchmark(csv_file_path="compilation_results.csv", visualisation_path="visualisation"):
-    plotter = BenchmarkPlotter(csv_file_path, visualisation_path)
+def plot_compilation_benchmark(csv_file_path="compilation_results.csv", visualisation_path="visualisation", num_workers=None):
+    plotter = BenchmarkPlotter(csv_file_path, visualisation_path, num_workers)
     if plotter.load_data():
         plotter.run_plot_config("Full Compilation", ["opt_level", "algorithm", "benchmark_level"], ["compiler"])
         plotter.run_plot_config("Full Compilation", ["opt_level", "hardware", "benchmark_level"], ["compiler"])
@@ -0,0 +1,222 @@
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Dict, Any
+
+import pandas as pd
+
+import quantum_bench.data.mqt_provider as mqt
+from quantum_bench.artifacts import DEFAULT_STORE_DIR, ArtifactStore
+from quantum_bench.compilers.registry import available_compilers
+from quantum_bench.executor import BenchmarkJob, execute_job, failed_row, preload_modules
+from quantum_bench.hardware.model import HardwareModel
+from quantum_bench.isolation import IsolatedPool
+from quantum_bench.multiseed import OBJECTIVES
+from quantum_bench.results import open_result_writer, remove_results
+
+DEFAULT_OPT_LEVELS = [1, 2, 3]
+
+
+@dataclass
+class PortfolioRace:
+    """The compiler runs of one portfolio race and the configuration that won it."""
+    rows: List[Dict[str, Any]]
+    objective: str
+    # Seconds from the start of the race until each row's run finished, None if it did not finish.
+    finish_times: List[Optional[float]]
+    wall_time: float
+    output_path: Optional[str] = None
+
+    @property
+    def candidates(self) -> List[int]:
+        """Indices of the rows eligible to win: successful, hardware-compliant and with the objective measured."""
+        return [i for i, row in enumerate(self.rows)
+                if row.get("success") and row.get("compliant") and row.get(self.objective) is not None]
+
+    @property
+    def winner(self) -> Optional[Dict[str, Any]]:
+        """The eligible row with the lowest objective, the earliest finished one on ties."""
+        candidates = self.candidates
+        if not candidates:
+            return None
+        return self.rows[min(candidates, key=lambda i: (self.rows[i][self.objective], self.finish_times[i]))]
+
+    def summary(self) -> Dict[str, Any]:
+        """Returns the winning configuration and the outcome of the other runs."""
+        winner = self.winner
+        statuses = [row.get("status") for row in self.rows]
+        return {
+            "objective": self.objective,
+            "configurations": len(self.rows),
+            "finished": statuses.count("ok"),
+            "compliant": len(self.candidates),
+            "timeout": statuses.count("timeout"),
+            "cancelled": statuses.count("cancelled"),
+            "winner_compiler": winner["compiler"] if winner else None,
+            "winner_opt_level": winner["opt_level"] if winner else None,
+            "winner_value": winner[self.objective] if winner else None,
+            "winner_artifact": winner.get("artifact") if winner else None,
+            "winner_finish_time": self.finish_times[self.rows.index(winner)] if winner else None,
+            "wall_time": self.wall_time,
+        }
+
+
+def race(hardware: HardwareModel, qasm_file: str, time_budget: float = 60, objective: str = "2q_gates",
+         compilers: Optional[List[str]] = None, opt_levels: Optional[List[int]] = None,
+         active_phases: Optional[List[str]] = None, seed: Optional[int] = None, num_workers: Optional[int] = None,
+         target: Optional[float] = None, output_path: Optional[str] = None, artifact_dir: str = DEFAULT_STORE_DIR,
+         benchmark_level: str = "", algorithm: str = "", qubits: int = 0) -> PortfolioRace:
+    """
+    Compiles a circuit with every (compiler, optimization level) at the same time and keeps the best result.
+
+    Every configuration runs in its own child process (see IsolatedPool), which is killed when the budget
+    expires. Only results that are executable on the hardware (see executor.compliance_violation) can win.
+    With fewer workers than configurations, the lower optimization levels start first and the others
+    only get the remaining budget.
+
+    Args:
+        hardware: The target hardware model.
+        qasm_file: Path to the input QASM file.
+        time_budget: Wall-clock budget in seconds for the whole race.
+        objective: Metric to minimize, one of OBJECTIVES. After a final optimization, Qiskit and Pytket have
+                   decomposed their SWAP gates, so the default 2-qubit gate count is the comparable routing cost.
+        compilers: Names of the compilers to race. Defaults to all registered compilers.
+        opt_levels: Optimization levels to race. Defaults to DEFAULT_OPT_LEVELS.
+        active_phases: Phases to execute. Defaults to all phases.
+        seed: Random seed.
+        num_workers: Number of configurations running at a time, None runs all at once.
+        target: Objective value that is good enough. The race ends as soon as a compliant result reaches it
+                and the remaining runs are cancelled.
+        output_path: If given, the winning circuit is written to this QASM file.
+        artifact_dir: Directory of the artifact store the compiled circuits are kept in.
+        benchmark_level: Benchmark level recorded in the rows.
+        algorithm: Algorithm recorded in the rows.
+        qubits: Qubit count recorded in the rows.
+
+    Returns:
+        The runs of all configurations.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective: {objective}. Available: {OBJECTIVES}")
+    compilers = compilers or available_compilers()
+    opt_levels = opt_levels or DEFAULT_OPT_LEVELS
+
+    jobs = [
+        BenchmarkJob(hardware=hardware.name, benchmark_level=benchmark_level, algorithm=algorithm, qubits=qubits,
+                     compiler=compiler_name, opt_level=opt_level, run=0, qasm_path=qasm_file,
+                     active_phases=active_phases, seed=seed, artifact_dir=artifact_dir, check_compliance=True)
+        for opt_level in opt_levels for compiler_name in compilers
+    ]
+    num_workers = num_workers or len(jobs)
+    rows: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+    finish_times: List[Optional[float]] = [None] * len(jobs)
+
+    start = time.perf_counter()
+    deadline = start + time_budget
+    queued = deque(range(len(jobs)))
+    running = set()
+    with IsolatedPool(num_workers, preload=preload_modules(jobs)) as pool:
+        while queued or running:
+            while queued and len(running) < num_workers and time.perf_counter() < deadline:
+                index = queued.popleft()
+                pool.submit(index, execute_job, jobs[index], hardware, timeout=deadline - time.perf_counter())
+                running.add(index)
+            if not running:
+                break
+
+            result = pool.next_result()
+            running.discard(result.key)
+            job = jobs[result.key]
+            if result.status == "ok":
+                rows[result.key] = result.value
+                finish_times[result.key] = time.perf_counter() - start
+            else:
+                if result.status not in ("timeout", "oom"):
+                    print(f"Error during compilation: {result.value}")
+                rows[result.key] = failed_row(job, result.status, result.elapsed)
+            row = rows[result.key]
+            print(f"{job.compiler} opt{job.opt_level} finished after {time.perf_counter() - start:.2f}s: "
+                  f"{row['status']}, {objective}={row.get(objective)}, compliant={row.get('compliant')}")
+
+            if (target is not None and row.get("success") and row.get("compliant")
+                    and row.get(objective) is not None and row[objective] <= target):
+                print(f"{job.compiler} opt{job.opt_level} reached the target {objective}={target}, "
+                      f"cancelling the remaining runs.")
+                break
+    # Leaving the pool killed the runs still in progress.
+    wall_time = time.perf_counter() - start
+
+    rows = [row if row is not None else failed_row(job, "cancelled") for job, row in zip(jobs, rows)]
+    portfolio = PortfolioRace(rows, objective, finish_times, wall_time)
+    winner = portfolio.winner
+    if winner is None:
+        print(f"No configuration produced a compliant circuit within {time_budget}s.")
+    elif output_path and winner.get("artifact"):
+        portfolio.output_path = ArtifactStore(artifact_dir).extract(winner["artifact"], output_path)
+    return portfolio
+
+
+def run_portfolio_benchmark(hardware_names: List[str], algo_names: List[str], qubit_ranges: List[int],
+                            benchmark_level: str = "INDEP", opt_levels: Optional[List[int]] = None,
+                            compilers: Optional[List[str]] = None, time_budget: float = 60,
+                            objective: str = "2q_gates", active_phases: Optional[List[str]] = None,
+                            seed: Optional[int] = None, num_workers: Optional[int] = None,
+                            output_file: str = "portfolio_results.csv") -> pd.DataFrame:
+    """
+    Runs a portfolio race for every input circuit.
+
+    The runs of all configurations are written to the result file, runs killed by the budget with status
+    'timeout' and runs never started or cancelled with status 'cancelled'. The winner of every race is
+    written to '<output>_portfolio.csv'.
+
+    Args:
+        hardware_names: List of hardware names to benchmark against.
+        algo_names: List of algorithm names to benchmark.
+        qubit_ranges: Qubit counts to test.
+        benchmark_level: Benchmark level of the input circuits.
+        opt_levels: Optimization levels to race. Defaults to DEFAULT_OPT_LEVELS.
+        compilers: Names of the compilers to race. Defaults to all registered compilers.
+        time_budget: Wall-clock budget in seconds per race.
+        objective: Metric to minimize, one of OBJECTIVES (see race).
+        active_phases: Phases to execute. Defaults to all phases.
+        seed: Random seed.
+        num_workers: Number of configurations running at a time, None runs all at once.
+        output_file: Path to the result file.
+
+    Returns:
+        The winners table, one row per race.
+    """
+    remove_results(output_file)
+
+    summaries = []
+    with open_result_writer(output_file) as writer:
+        for hardware_name in hardware_names:
+            hardware = mqt.get_hardware_model(hardware_name)
+            if not hardware:
+                print(f"Skipping unknown hardware: {hardware_name}")
+                continue
+            for algo_name in algo_names:
+                for n_qubits in qubit_ranges:
+                    if n_qubits > hardware.num_qubits:
+                        continue
+                    qasm_path = mqt.get_circuit(hardware_name, algo_name, n_qubits, benchmark_level)
+                    if not qasm_path:
+                        continue
+                    print(f"--- Portfolio race: {algo_name} ({n_qubits} Qubits) on {hardware_name}, "
+                          f"{time_budget}s ---")
+                    portfolio = race(hardware, qasm_path, time_budget, objective, compilers, opt_levels,
+                                     active_phases, seed, num_workers, benchmark_level=benchmark_level,
+                                     algorithm=algo_name, qubits=n_qubits)
+                    for row in portfolio.rows:
+                        writer.write(row)
+                    summary = {"hardware": hardware_name, "benchmark_level": benchmark_level,
+                               "algorithm": algo_name, "qubits": n_qubits, **portfolio.summary()}
+                    print(summary)
+                    summaries.append(summary)
+
+    winners = pd.DataFrame(summaries)
+    winners_file = f"{os.path.splitext(output_file.rstrip(os.sep))[0]}_portfolio.csv"
+    winners.to_csv(winners_file, index=False)
+    print(f"Portfolio benchmark finished. Results saved to {output_file}, winners to {winners_file}.")
+    return winners
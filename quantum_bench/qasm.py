@@ -0,0 +1,211 @@
+import re
+from typing import Iterator, List, NamedTuple, Tuple, Dict, TextIO, Optional
+
+_NAME_PATTERN = re.compile(r"[A-Za-z_]\w*")
+_ARGUMENT_PATTERN = re.compile(r"^\s*([A-Za-z_]\w*)\s*(?:\[\s*(\d+)\s*\])?\s*$")
+_CONDITION_PATTERN = re.compile(r"^if\s*\(\s*([A-Za-z_]\w*)\s*==\s*\d+\s*\)\s*")
+# Header comment of Cirq exports listing the qubit of every register index, e.g. '// Qubits: [1, 4, 7]'.
+_QUBITS_COMMENT_PATTERN = re.compile(r"^//\s*Qubits:\s*\[(.*)\]\s*$")
+
+# Statements that declare or include something but apply no operation.
+_DECLARATIONS = {"OPENQASM", "include", "opaque"}
+
+
+class Operation(NamedTuple):
+    """A single gate, measurement, reset or barrier applied to concrete (flattened) qubit and clbit indices."""
+    name: str
+    qubits: Tuple[int, ...]
+    clbits: Tuple[int, ...]
+
+
+def iter_operations(qasm_file: str) -> Iterator[Operation]:
+    """
+    Streams the operations of an OpenQASM 2 file without building a circuit object.
+
+    Register arguments are broadcast as in OpenQASM 2 ('h q;' yields one operation per qubit) and registers are
+    flattened to global indices in declaration order. Custom gate definitions are skipped; their applications
+    are yielded as single operations.
+
+    Args:
+        qasm_file: Path to the OpenQASM 2 file.
+
+    Yields:
+        The operations in file order.
+    """
+    qregs: Dict[str, Tuple[int, int]] = {}
+    cregs: Dict[str, Tuple[int, int]] = {}
+    with open(qasm_file, "r") as f:
+        for statement in _iter_statements(f):
+            keyword = statement.split(None, 1)[0]
+            if keyword in _DECLARATIONS:
+                continue
+            if keyword in ("qreg", "creg"):
+                registers = qregs if keyword == "qreg" else cregs
+                name, size = _ARGUMENT_PATTERN.match(statement[len(keyword):]).groups()
+                registers[name] = (sum(s for _, s in registers.values()), int(size))
+                continue
+
+            condition_bits: Tuple[int, ...] = ()
+            condition = _CONDITION_PATTERN.match(statement)
+            if condition:
+                offset, size = cregs[condition.group(1)]
+                condition_bits = tuple(range(offset, offset + size))
+                statement = statement[condition.end():]
+
+            yield from _parse_operation(statement, qregs, cregs, condition_bits)
+
+
+def interaction_pairs(qasm_file: str) -> List[Tuple[int, int]]:
+    """
+    Returns the qubit pairs of all 2-qubit operations (excluding barriers) of an OpenQASM 2 file.
+
+    Args:
+        qasm_file: Path to the OpenQASM 2 file.
+
+    Returns:
+        The interacting qubit pairs in file order.
+    """
+    return [op.qubits for op in iter_operations(qasm_file) if len(op.qubits) == 2 and op.name != "barrier"]
+
+
+def qubit_labels(qasm_file: str) -> Optional[List[int]]:
+    """
+    Returns the physical qubit of every flattened qubit index, if the file lists them in a header comment.
+
+    Cirq exports only the used qubits as a compact register and names the device qubits in a '// Qubits: [...]'
+    comment. Qiskit and Pytket export registers indexed by physical qubit and have no such comment.
+
+    Args:
+        qasm_file: Path to the OpenQASM 2 file.
+
+    Returns:
+        The physical qubit of every index, or None if the indices are the physical qubits.
+    """
+    with open(qasm_file, "r") as f:
+        for line in f:
+            line = line.strip()
+            match = _QUBITS_COMMENT_PATTERN.match(line)
+            if match:
+                try:
+                    return [int(label) for label in match.group(1).split(",")]
+                except ValueError:
+                    return None
+            if line.startswith("qreg"):
+                return None
+    return None
+
+
+def compute_metrics(qasm_file: str) -> Dict[str, int]:
+    """
+    Computes gate count, depth, 2-qubit and SWAP gate count of an OpenQASM 2 file in a single streaming pass.
+
+    The definitions are identical for every compiler: barriers are ignored, measurements and resets count as gates,
+    and the depth is the longest path over qubit and clbit wires (as in Qiskit's QuantumCircuit.depth).
+
+    Args:
+        qasm_file: Path to the OpenQASM 2 file.
+
+    Returns:
+        Dictionary with 'gate_count', 'depth', '2q_gates' and 'swap_gates'.
+    """
+    qubit_levels: List[int] = []
+    clbit_levels: List[int] = []
+    gate_count = two_qubit_gates = swap_gates = depth = 0
+
+    for op in iter_operations(qasm_file):
+        if op.name == "barrier":
+            continue
+
+        gate_count += 1
+        if len(op.qubits) >= 2:
+            two_qubit_gates += 1
+        if op.name == "swap":
+            swap_gates += 1
+
+        for levels, wires in ((qubit_levels, op.qubits), (clbit_levels, op.clbits)):
+            if wires and max(wires) >= len(levels):
+                levels.extend([0] * (max(wires) + 1 - len(levels)))
+        level = max([qubit_levels[q] for q in op.qubits] + [clbit_levels[c] for c in op.clbits], default=0) + 1
+        for q in op.qubits:
+            qubit_levels[q] = level
+        for c in op.clbits:
+            clbit_levels[c] = level
+        depth = max(depth, level)
+
+    return {"gate_count": gate_count, "depth": depth, "2q_gates": two_qubit_gates, "swap_gates": swap_gates}
+
+
+def _iter_statements(f: TextIO) -> Iterator[str]:
+    """Yields the statements of a QASM file with comments and gate definition bodies removed."""
+    pending = ""
+    in_body = False
+    for line in f:
+        pending += " " + line.split("//", 1)[0].strip()
+        while True:
+            if in_body:
+                end = pending.find("}")
+                if end < 0:
+                    pending = ""
+                    break
+                pending = pending[end + 1:]
+                in_body = False
+                continue
+
+            semicolon = pending.find(";")
+            brace = pending.find("{")
+            if brace >= 0 and (semicolon < 0 or brace < semicolon):
+                # Gate definition header, its body is skipped.
+                pending = pending[brace + 1:]
+                in_body = True
+                continue
+            if semicolon < 0:
+                break
+
+            statement = pending[:semicolon].strip()
+            pending = pending[semicolon + 1:]
+            if statement:
+                yield statement
+
+
+def _parse_operation(statement: str, qregs: Dict[str, Tuple[int, int]], cregs: Dict[str, Tuple[int, int]],
+                     condition_bits: Tuple[int, ...]) -> Iterator[Operation]:
+    name = _NAME_PATTERN.match(statement).group(0)
+    rest = statement[len(name):].lstrip()
+    if rest.startswith("("):
+        depth = 0
+        for i, char in enumerate(rest):
+            depth += char == "("
+            depth -= char == ")"
+            if depth == 0:
+                rest = rest[i + 1:]
+                break
+
+    if name == "measure":
+        qubit_arg, clbit_arg = rest.split("->")
+        for qubits, clbits in _broadcast([_resolve(qubit_arg, qregs)], [_resolve(clbit_arg, cregs)]):
+            yield Operation(name, qubits, clbits + condition_bits)
+        return
+
+    arguments = [_resolve(arg, qregs) for arg in rest.split(",")] if rest.strip() else []
+    if name == "barrier":
+        yield Operation(name, tuple(q for arg in arguments for q in arg), condition_bits)
+        return
+
+    for qubits, _ in _broadcast(arguments, []):
+        yield Operation(name, qubits, condition_bits)
+
+
+def _resolve(argument: str, registers: Dict[str, Tuple[int, int]]) -> List[int]:
+    """Resolves 'reg[i]' to [index] and 'reg' to the indices of the whole register."""
+    name, index = _ARGUMENT_PATTERN.match(argument).groups()
+    offset, size = registers[name]
+    if index is not None:
+        return [offset + int(index)]
+    return list(range(offset, offset + size))
+
+
+def _broadcast(qubit_args: List[List[int]], clbit_args: List[List[int]]) -> Iterator[Tuple[Tuple[int, ...], Tuple[int, ...]]]:
+    width = max((len(arg) for arg in qubit_args + clbit_args), default=1)
+    for i in range(width):
+        yield (tuple(arg[i] if len(arg) > 1 else arg[0] for arg in qubit_args),
+               tuple(arg[i] if len(arg) > 1 else arg[0] for arg in clbit_args))
@@ -0,0 +1,239 @@
+import dataclasses
+import math
+import os
+import random
+import statistics
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import List, Dict, Any, Iterator, Tuple, Optional, Set
+
+import pandas as pd
+
+from quantum_bench.executor import BenchmarkJob, execute_job
+from quantum_bench.hardware.model import HardwareModel
+from quantum_bench.results import KEY_COLUMNS, ResultKey, make_key, read_results
+
+# Columns identifying a configuration, whose runs are measured together.
+CONFIGURATION_COLUMNS = [column for column in KEY_COLUMNS if column != "run"]
+
+
+@dataclass
+class RepetitionPolicy:
+    """Controls how often a configuration is repeated in the adaptive measurement mode."""
+    warmup_runs: int = 1
+    min_runs: int = 6
+    max_runs: int = 50
+    target_relative_width: float = 0.05
+    time_budget: float = 60.0
+    confidence: float = 0.95
+    seed: Optional[int] = None
+
+
+def median_confidence_interval(samples: List[float], confidence: float = 0.95) -> Tuple[float, float, float]:
+    """
+    Returns the median of the samples and a distribution-free confidence interval for it.
+
+    The interval bounds are order statistics: the number of samples below the true median is binomially
+    distributed with p = 0.5, so [x_(l+1), x_(n-l)] covers it with probability 1 - 2 * P(X <= l).
+    The largest l reaching the confidence level is used. If even the full range does not reach it
+    (fewer than 6 samples at 95%), the full range is returned.
+
+    Args:
+        samples: The measured values.
+        confidence: The confidence level of the interval.
+
+    Returns:
+        Tuple of (median, lower bound, upper bound).
+    """
+    values = sorted(samples)
+    n = len(values)
+    median = statistics.median(values)
+
+    lower = 0
+    cdf = 0.0
+    for l in range(n // 2):
+        cdf += math.comb(n, l) / 2 ** n
+        if 1 - 2 * cdf < confidence:
+            break
+        lower = l
+    return median, values[lower], values[n - 1 - lower]
+
+
+class _Measurement:
+    """Samples of one compiler configuration."""
+
+    def __init__(self, job: BenchmarkJob, recorded: List[Optional[float]] = ()):
+        self.job = job
+        self.samples: List[float] = []
+        self.elapsed = 0.0
+        self.failed = False
+        self.runs = 0
+        # Runs recorded by an interrupted benchmark count as if they had just been measured.
+        for compile_time in recorded:
+            self.add(compile_time)
+            self.elapsed += compile_time or 0.0
+
+    def add(self, compile_time: Optional[float]):
+        """Records the compile time of a run, None for a failed run."""
+        self.runs += 1
+        if compile_time is None:
+            self.failed = True
+        else:
+            self.samples.append(compile_time)
+
+    def interval(self, confidence: float) -> Tuple[float, float, float]:
+        return median_confidence_interval(self.samples, confidence)
+
+    def relative_width(self, confidence: float) -> float:
+        median, low, high = self.interval(confidence)
+        return (high - low) / median if median > 0 else math.inf
+
+    def is_done(self, policy: RepetitionPolicy) -> bool:
+        if self.failed or len(self.samples) >= policy.max_runs or self.elapsed >= policy.time_budget:
+            return True
+        return len(self.samples) >= policy.min_runs and self.relative_width(policy.confidence) <= policy.target_relative_width
+
+    def summary(self, policy: RepetitionPolicy) -> Dict[str, Any]:
+        row = {
+            "hardware": self.job.hardware,
+            "benchmark_level": self.job.benchmark_level,
+            "algorithm": self.job.algorithm,
+            "qubits": self.job.qubits,
+            "compiler": self.job.compiler,
+            "opt_level": self.job.opt_level,
+            "samples": len(self.samples),
+            "compile_time_median": None,
+            "compile_time_ci_low": None,
+            "compile_time_ci_high": None,
+            "relative_width": None,
+            "converged": False,
+        }
+        if self.samples:
+            median, low, high = self.interval(policy.confidence)
+            row.update({
+                "compile_time_median": median,
+                "compile_time_ci_low": low,
+                "compile_time_ci_high": high,
+                "relative_width": self.relative_width(policy.confidence),
+                "converged": len(self.samples) >= policy.min_runs
+                             and self.relative_width(policy.confidence) <= policy.target_relative_width,
+            })
+        return row
+
+
+def configuration_key(job: BenchmarkJob) -> ResultKey:
+    """Returns the key of a job's configuration, the key of its run 0."""
+    return make_key(job.hardware, job.benchmark_level, job.algorithm, job.qubits, job.compiler, job.opt_level, 0)
+
+
+def iter_adaptive_results(jobs: List[BenchmarkJob], hardware_models: Dict[str, HardwareModel],
+                          policy: RepetitionPolicy, summaries: List[Dict[str, Any]],
+                          recorded: Optional[Dict[ResultKey, List[Optional[float]]]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Repeats every job until the confidence interval of its median compile time is narrow enough.
+
+    The jobs of a benchmark case and optimization level are measured together: after the warm-up runs
+    (not recorded), every round executes one run of each unfinished compiler in a shuffled order, so drift
+    (e.g. thermal throttling, cache state) affects all compilers alike. A compiler stops once the relative
+    CI width reaches the target after at least min_runs runs, after max_runs runs, once its runs have used up
+    the time budget, or on its first failure. All runs are executed in-process, one at a time.
+
+    Args:
+        jobs: One job (run 0) per compiler configuration.
+        hardware_models: Hardware models referenced by the jobs, keyed by name.
+        policy: The repetition policy.
+        summaries: List to which the summary of every configuration is appended once it is finished.
+        recorded: Compile times of runs recorded before, keyed by configuration (see load_recorded_runs).
+                  A configuration continues from its recorded runs instead of measuring them again.
+
+    Yields:
+        The result row of every recorded run.
+    """
+    rng = random.Random(policy.seed)
+
+    # Jobs of the same benchmark case and optimization level, in job order.
+    groups: Dict[Tuple, List[BenchmarkJob]] = defaultdict(list)
+    for job in jobs:
+        groups[(job.hardware, job.benchmark_level, job.algorithm, job.qubits, job.opt_level)].append(job)
+
+    recorded = recorded or {}
+    for group_jobs in groups.values():
+        measurements = [_Measurement(job, recorded.get(configuration_key(job), [])) for job in group_jobs]
+        active = [measurement for measurement in measurements if not measurement.is_done(policy)]
+
+        for _ in range(policy.warmup_runs if active else 0):
+            for measurement in rng.sample(active, len(active)):
+                execute_job(dataclasses.replace(measurement.job, run_verification=False, run_visualisation=False),
+                            hardware_models[measurement.job.hardware])
+
+        while active:
+            for measurement in rng.sample(active, len(active)):
+                job = dataclasses.replace(measurement.job, run=measurement.runs,
+                                          is_reference=measurement.job.is_reference and not measurement.runs)
+                start = time.perf_counter()
+                row = execute_job(job, hardware_models[job.hardware])
+                measurement.elapsed += time.perf_counter() - start
+
+                success = row.get("success") and row.get("compile_time") is not None
+                measurement.add(row["compile_time"] if success else None)
+                yield row
+
+            active = [measurement for measurement in active if not measurement.is_done(policy)]
+
+        summaries.extend(measurement.summary(policy) for measurement in measurements)
+
+
+def load_recorded_runs(output_file: str) -> Dict[ResultKey, List[Optional[float]]]:
+    """
+    Reads the runs of every configuration already recorded in a result file.
+
+    Args:
+        output_file: Path to the result file.
+
+    Returns:
+        Compile time of every run in run order, None for failed runs, keyed by configuration (see configuration_key).
+        Empty if the file does not exist or cannot be read.
+    """
+    if not os.path.exists(output_file):
+        return {}
+
+    try:
+        df = read_results(output_file, columns=KEY_COLUMNS + ["compile_time", "success"])
+    except Exception as e:
+        print(f"Could not read existing results from {output_file}: {e}")
+        return {}
+
+    df = df.dropna(subset=KEY_COLUMNS).sort_values("run")
+    success = df["success"].fillna(False).astype(bool) & df["compile_time"].notna()
+    runs: Dict[ResultKey, List[Optional[float]]] = defaultdict(list)
+    for values, compile_time, ok in zip(df[CONFIGURATION_COLUMNS].itertuples(index=False, name=None),
+                                        df["compile_time"], success):
+        runs[make_key(*values, 0)].append(float(compile_time) if ok else None)
+    return dict(runs)
+
+
+def load_summarized_configurations(stats_file: str) -> Set[ResultKey]:
+    """Returns the keys of the configurations (see configuration_key) with a summary in the stats file."""
+    if not os.path.exists(stats_file):
+        return set()
+
+    try:
+        df = pd.read_csv(stats_file, usecols=CONFIGURATION_COLUMNS).dropna()
+    except Exception as e:
+        print(f"Could not read existing summaries from {stats_file}: {e}")
+        return set()
+
+    return {make_key(*values, 0) for values in df[CONFIGURATION_COLUMNS].itertuples(index=False, name=None)}
+
+
+def stats_file_path(output_file: str) -> str:
+    """Returns the path of the repetition summary file belonging to a result file."""
+    return f"{os.path.splitext(output_file)[0]}_stats.csv"
+
+
+def write_summaries(summaries: List[Dict[str, Any]], stats_file: str):
+    """Appends configuration summaries to a CSV file, writing the header if the file is new."""
+    if not summaries:
+        return
+    pd.DataFrame(summaries).to_csv(stats_file, mode="a", header=not os.path.exists(stats_file), index=False)
@@ -0,0 +1,367 @@
+import csv
+import os
+import shutil
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Set, Tuple, Dict, Any, List, Optional, Union, Iterator, Callable
+
+import pandas as pd
+
+from quantum_bench.compilers.base import PHASES
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Columns identifying a single compiler run in the result files.
+KEY_COLUMNS = ["hardware", "benchmark_level", "algorithm", "qubits", "compiler", "opt_level", "run"]
+
+# Metrics computed for the input circuit and the compiled circuit.
+CIRCUIT_METRICS = ["gate_count", "depth", "2q_gates", "swap_gates"]
+
+# Known result columns and their (nullable) pandas dtypes, in output order.
+RESULT_SCHEMA = {
+    "hardware": "string",
+    "benchmark_level": "string",
+    "algorithm": "string",
+    "qubits": "Int64",
+    "compiler": "string",
+    "opt_level": "Int64",
+    "run": "Int64",
+    "seed": "Int64",
+    **{metric: "Int64" for metric in CIRCUIT_METRICS},
+    "trivial_layout_swap_estimate": "Int64",
+    "compile_time": "Float64",
+    "compile_cpu_time": "Float64",
+    **{f"{phase}_{kind}": "Float64" for phase in PHASES for kind in ["time", "cpu_time"]},
+    "compile_peak_rss_mb": "Float64",
+    **{f"{phase}_peak_rss_mb": "Float64" for phase in PHASES},
+    "compile_peak_traced_mb": "Float64",
+    **{f"{phase}_peak_traced_mb": "Float64" for phase in PHASES},
+    **{f"initial_{metric}": "Int64" for metric in CIRCUIT_METRICS},
+    "success": "boolean",
+    "compliant": "boolean",
+    "status": "string",
+    "Equivalence": "string",
+    "artifact": "string",
+    "checkpoint": "string",
+}
+
+# Low-cardinality string columns, loaded as categoricals so every distinct value is stored only once.
+CATEGORY_COLUMNS = ["hardware", "benchmark_level", "algorithm", "compiler", "status", "Equivalence", "checkpoint"]
+
+# Dtypes used when loading result files.
+LOAD_SCHEMA = {column: "category" if column in CATEGORY_COLUMNS else dtype for column, dtype in RESULT_SCHEMA.items()}
+
+# Predicate on a column, e.g. ("compiler", "==", "Qiskit") or ("qubits", "in", [4, 8]).
+Filter = Tuple[str, str, Any]
+
+PARQUET_SUFFIX = ".parquet"
+
+ResultKey = Tuple[str, str, str, int, str, int, int]
+
+
+def make_key(hardware: str, benchmark_level: str, algorithm: str, qubits: int, compiler: str,
+             opt_level: int, run: int) -> ResultKey:
+    """Builds the normalized key of a compiler run."""
+    return str(hardware), str(benchmark_level), str(algorithm), int(qubits), str(compiler), int(opt_level), int(run)
+
+
+def flatten_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Flattens a result row into scalar columns.
+
+    Nested metric dictionaries (e.g. 'initial') become prefixed columns ('initial_gate_count'),
+    and '-' placeholders of failed runs become missing values.
+
+    Args:
+        row: The result row as returned by the executor.
+
+    Returns:
+        The flattened row.
+    """
+    flat = {}
+    for column, value in row.items():
+        if isinstance(value, dict):
+            for metric, metric_value in value.items():
+                flat[f"{column}_{metric}"] = None if metric_value == '-' else metric_value
+        else:
+            flat[column] = None if isinstance(value, str) and value == '-' else value
+    return flat
+
+
+def to_typed_frame(rows: List[Dict[str, Any]], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Builds a DataFrame of flattened rows using the result schema dtypes.
+
+    Args:
+        rows: Flattened result rows.
+        columns: Columns of the frame. Defaults to all schema columns followed by any unknown columns of the rows,
+                 so every batch of a result file shares the same layout.
+
+    Returns:
+        The typed DataFrame.
+    """
+    if columns is None:
+        extra = []
+        for row in rows:
+            extra.extend(c for c in row if c not in RESULT_SCHEMA and c not in extra)
+        columns = list(RESULT_SCHEMA) + extra
+
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    dtypes = {c: RESULT_SCHEMA[c] for c in columns if c in RESULT_SCHEMA}
+    return df.astype(dtypes)
+
+
+class ResultWriter(ABC):
+    """Buffers result rows and flushes them to the result file in batches."""
+
+    def __init__(self, path: str, buffer_size: int = 100):
+        """
+        Initializes the writer.
+
+        Args:
+            path: Path of the result file.
+            buffer_size: Number of rows buffered before they are flushed.
+        """
+        self.path = path
+        self.buffer_size = buffer_size
+        self._rows: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def write(self, row: Dict[str, Any]):
+        """Adds a result row, flushing the buffer once it is full."""
+        with self._lock:
+            self._rows.append(flatten_row(row))
+            if len(self._rows) < self.buffer_size:
+                return
+            rows, self._rows = self._rows, []
+            self._write_rows(rows)
+
+    def flush(self):
+        """Writes all buffered rows to the result file."""
+        with self._lock:
+            rows, self._rows = self._rows, []
+            if rows:
+                self._write_rows(rows)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @abstractmethod
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        """Writes a batch of flattened rows to the result file."""
+        pass
+
+
+class CsvResultWriter(ResultWriter):
+    """
+    Appends result batches to a CSV file, locking it so that several processes can share the file.
+
+    If a batch has columns the header of the file lacks (e.g. a file written before a column was added),
+    the file is rewritten with the new columns under the same lock, the existing rows leaving them empty.
+    """
+
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        with open(self.path, "a+", newline="") as f:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                header = f.readline()
+                columns = next(csv.reader([header])) if header else None
+                if columns:
+                    missing = []
+                    for row in rows:
+                        missing.extend(c for c in row if c not in columns and c not in missing)
+                    if missing:
+                        columns = self._add_columns(f, columns, missing)
+                df = to_typed_frame(rows, columns)
+
+                f.seek(0, os.SEEK_END)
+                f.write(df.to_csv(header=not header, index=False))
+                f.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _add_columns(self, f, columns: List[str], missing: List[str]) -> List[str]:
+        """Adds the missing columns to the locked file in schema order and returns its new columns."""
+        known = set(columns) | set(missing)
+        new_columns = ([c for c in RESULT_SCHEMA if c in known]
+                       + [c for c in columns + missing if c not in RESULT_SCHEMA])
+        print(f"Adding columns {missing} to the header of {self.path}.")
+
+        f.seek(0)
+        existing = list(csv.DictReader(f))
+        f.seek(0)
+        # Rewritten in place rather than replaced, so the lock other writers are waiting on stays valid.
+        f.truncate()
+        writer = csv.DictWriter(f, fieldnames=new_columns, restval="", lineterminator="\n")
+        writer.writeheader()
+        writer.writerows(existing)
+        return new_columns
+
+
+class ParquetResultWriter(ResultWriter):
+    """
+    Writes result batches as part files of a Parquet dataset directory.
+
+    Every batch becomes its own file named by creation time and process id,
+    so concurrent writers never touch the same file and the parts read back in write order.
+    """
+
+    def _write_rows(self, rows: List[Dict[str, Any]]):
+        os.makedirs(self.path, exist_ok=True)
+        filename = os.path.join(self.path, f"part-{time.time_ns()}-{os.getpid()}{PARQUET_SUFFIX}")
+        tmp_filename = f"{filename}.tmp"
+        to_typed_frame(rows).to_parquet(tmp_filename, engine="pyarrow", index=False)
+        os.replace(tmp_filename, filename)
+
+
+def open_result_writer(path: str, buffer_size: int = 100) -> ResultWriter:
+    """
+    Creates the result writer matching the file type of the path.
+
+    Args:
+        path: Result file path. Paths ending in '.parquet' are written as Parquet dataset, all others as CSV.
+        buffer_size: Number of rows buffered before they are flushed.
+
+    Returns:
+        The result writer.
+    """
+    if path.endswith(PARQUET_SUFFIX):
+        return ParquetResultWriter(path, buffer_size)
+    return CsvResultWriter(path, buffer_size)
+
+
+def read_results(path: str, columns: Optional[List[str]] = None, filters: Optional[List[Filter]] = None,
+                 chunksize: Optional[int] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+    """
+    Reads a result file written by a ResultWriter with the dtypes of LOAD_SCHEMA.
+
+    Dimension columns become categoricals, metrics nullable numeric types and '-' placeholders missing values.
+    Filters of a Parquet dataset are pushed down to the reader, so non-matching row groups are never loaded.
+    CSV files are filtered while they are read, chunk by chunk.
+
+    Args:
+        path: Path of the CSV file or Parquet dataset.
+        columns: Columns to read. Defaults to all columns.
+        filters: Conditions all returned rows fulfil, as (column, operator, value) with the operators
+                 '==', '!=', '<', '<=', '>', '>=', 'in' and 'not in'. The columns need not be among the read columns.
+        chunksize: If set, an iterator over frames of at most this many rows is returned instead of a single frame.
+
+    Returns:
+        The results as DataFrame, or an iterator of DataFrames if chunksize is set.
+    """
+    chunks = _iter_result_chunks(path, columns, filters, chunksize or 1_000_000)
+    if chunksize:
+        return chunks
+    frames = list(chunks)
+    if len(frames) == 1:
+        return frames[0]
+    # Chunks have different categories, which concat turns back into strings.
+    return _cast(pd.concat(frames, ignore_index=True))
+
+
+def result_columns(path: str) -> List[str]:
+    """Returns the column names of a result file without reading its rows (CSV header or Parquet schema)."""
+    if path.endswith(PARQUET_SUFFIX):
+        import pyarrow.dataset as ds
+        return ds.dataset(path, format="parquet").schema.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def _iter_result_chunks(path: str, columns: Optional[List[str]], filters: Optional[List[Filter]],
+                        chunksize: int) -> Iterator[pd.DataFrame]:
+    filter_columns = [column for column, _, _ in filters or []]
+    read_columns = list(dict.fromkeys(columns + filter_columns)) if columns else None
+
+    if path.endswith(PARQUET_SUFFIX):
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        dataset = ds.dataset(path, format="parquet")
+        expression = pq.filters_to_expression(filters) if filters else None
+        batches = dataset.to_batches(columns=columns, filter=expression, batch_size=chunksize)
+        frames = (batch.to_pandas() for batch in batches)
+        yield from _typed_chunks(frames, lambda: dataset.schema.empty_table().to_pandas(), columns)
+        return
+
+    header = pd.read_csv(path, nrows=0).columns
+    dtypes = {c: LOAD_SCHEMA[c] for c in header if c in LOAD_SCHEMA and (not read_columns or c in read_columns)}
+    reader = pd.read_csv(path, usecols=read_columns, dtype=dtypes, na_values=["-"], chunksize=chunksize)
+    frames = (_apply_filters(chunk, filters) for chunk in reader)
+    yield from _typed_chunks(frames, lambda: pd.read_csv(path, usecols=read_columns, nrows=0), columns)
+
+
+def _typed_chunks(frames: Iterator[pd.DataFrame], empty: Callable[[], pd.DataFrame],
+                  columns: Optional[List[str]]) -> Iterator[pd.DataFrame]:
+    """Projects the frames to the columns and casts them to LOAD_SCHEMA. Yields a typed empty frame if there are none."""
+    found = False
+    for frame in frames:
+        found = True
+        yield _cast(frame[columns] if columns else frame)
+    if not found:
+        frame = empty()
+        yield _cast(frame[columns] if columns else frame)
+
+
+def _cast(df: pd.DataFrame) -> pd.DataFrame:
+    return df.astype({c: LOAD_SCHEMA[c] for c in df.columns if c in LOAD_SCHEMA})
+
+
+_OPERATORS = {
+    "==": lambda s, v: s == v,
+    "!=": lambda s, v: s != v,
+    "<": lambda s, v: s < v,
+    "<=": lambda s, v: s <= v,
+    ">": lambda s, v: s > v,
+    ">=": lambda s, v: s >= v,
+    "in": lambda s, v: s.isin(v),
+    "not in": lambda s, v: ~s.isin(v),
+}
+
+
+def _apply_filters(df: pd.DataFrame, filters: Optional[List[Filter]]) -> pd.DataFrame:
+    for column, op, value in filters or []:
+        df = df[_OPERATORS[op](df[column], value).fillna(False).astype(bool)]
+    return df
+
+
+def remove_results(path: str):
+    """Deletes a result file or Parquet dataset if it exists."""
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def load_completed_keys(output_file: str) -> Set[ResultKey]:
+    """
+    Builds an index of the compiler runs already recorded in a result file.
+
+    Args:
+        output_file: Path to the result file.
+
+    Returns:
+        Set of keys of all recorded runs. Empty if the file does not exist or cannot be read.
+    """
+    if not os.path.exists(output_file):
+        return set()
+
+    try:
+        df = read_results(output_file, columns=KEY_COLUMNS).dropna()
+    except Exception as e:
+        print(f"Could not read existing results from {output_file}: {e}")
+        return set()
+
+    return {make_key(*values) for values in df.itertuples(index=False, name=None)}
@@ -1,20 +1,29 @@
 import os
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 
-import pandas as pd
-
-from quantum_bench.compilers.cirq_adapter import CirqAdapter
-from quantum_bench.compilers.pytket_adapter import PytketAdapter
-from quantum_bench.compilers.qiskit_adapter import QiskitAdapter
 import quantum_bench.data.mqt_provider as mqt
-from quantum_bench.plotter import plot_results, plot_mapping_benchmark, plot_compilation_benchmark
+from quantum_bench.aggregate import load_summary, summary_file_path
+from quantum_bench.compilers.registry import available_compilers
+from quantum_bench.executor import BenchmarkJob, VERIFICATION_FIELD, iter_results
+from quantum_bench.isolation import IsolatedPool, IsolatedResult
+from quantum_bench.repetition import (RepetitionPolicy, iter_adaptive_results, load_recorded_runs,
+                                     load_summarized_configurations, stats_file_path, write_summaries)
+from quantum_bench.scheduling import CostModel, print_schedule, schedule_jobs
+from quantum_bench.shards import manifest_file_path, parse_shard, select_shard, shard_output_file, write_manifest
+from quantum_bench.results import load_completed_keys, make_key, open_result_writer, remove_results, ResultWriter
 
 
 def run_benchmark(hardware_names: List[str], algo_names: List[str], qubit_ranges: List[int], benchmark_levels: List[str],
                   opt_levels: List[int], num_runs: int = 1,
                   run_verification: bool = False, run_visualisation: bool = False, run_plotter: bool = False,
                   output_file: str = "benchmark_results.csv", visualisation_path: str = "visualisation", seed: int = None,
-                  active_phases: Optional[List[str]] = None):
+                  active_phases: Optional[List[str]] = None, num_workers: Optional[int] = 1, resume: bool = False,
+                  metric_source: str = "qasm", verification_workers: int = 1,
+                  verification_timeout: Optional[float] = 300, job_timeout: Optional[float] = None,
+                  memory_limit_mb: Optional[float] = None, repetition: Optional[RepetitionPolicy] = None,
+                  compilers: Optional[List[str]] = None, shard: Optional[str] = None,
+                  history_files: Optional[List[str]] = None, dry_run: bool = False,
+                  save_checkpoints: bool = False, resume_from: Optional[str] = None):
     """
     Executes the benchmark suite.
 
@@ -25,19 +34,78 @@ def run_benchmark(hardware_names: List[str], algo_names: List[str], qubit_ranges
         benchmark_levels: List of benchmark levels (e.g., 'ALG', 'INDEP').
         opt_levels: List of optimization levels to test.
         num_runs: Number of runs per configuration.
-        run_verification: Whether to verify the compiled circuits.
+        run_verification: Whether to verify the equivalence of every compiled circuit with its input.
         run_visualisation: Whether to visualize the circuits.
         run_plotter: Whether to plot the results after benchmarking.
-        output_file: Path to the output CSV file.
+        output_file: Path to the output file. Paths ending in '.parquet' are written as Parquet dataset, all others as CSV.
         visualisation_path: Path for visualisation output.
         seed: Random seed.
         active_phases: List of active compiler phases.
+        num_workers: Number of worker processes executing the compiler runs.
+                     1 runs everything in-process, None uses all available cores.
+        resume: Whether to keep an existing output file and only execute the runs missing from it.
+        metric_source: 'qasm' computes the circuit metrics of all compilers from the exported OpenQASM files
+                       with the same definitions (see quantum_bench.qasm.compute_metrics),
+                       'native' uses each framework's own metric functions.
+        verification_workers: Number of processes verifying compiled circuits while compilation continues.
+        verification_timeout: Time limit in seconds per verification. Exceeding it records 'Timeout'.
+        job_timeout: Wall-clock budget in seconds per compiler run. If this or memory_limit_mb is set, every run
+                     is executed in its own process and killed once it exceeds its budget. It is then recorded
+                     with status 'timeout' or 'oom', and larger qubit counts of the same compiler and algorithm
+                     are recorded with status 'skipped' instead of being executed.
+        memory_limit_mb: Resident set size budget in MB per compiler run.
+        repetition: Enables the adaptive measurement mode (see quantum_bench.repetition.iter_adaptive_results).
+                    Instead of num_runs, every configuration is repeated until the confidence interval of its
+                    median compile time is narrow enough. All runs are executed in-process, ignoring num_workers
+                    and the job budgets, and a summary per configuration is written to '<output>_stats.csv'.
+                    When resuming, configurations with a summary are skipped and the others continue from
+                    their recorded runs.
+        compilers: Names of the compilers to benchmark. Defaults to all registered compilers
+                   (see quantum_bench.compilers.registry). Only the selected adapters are imported.
+        shard: Executes only shard 'i/N' (0 <= i < N) of the benchmark cases and writes its results to
+               '<output>.shard-i-of-N<ext>'. All shards write the same job manifest '<output>.manifest.json',
+               'python -m quantum_bench.shards <output>' merges the shard results and checks them against it.
+        history_files: Earlier result files used to estimate the compile time of every run
+                       (see quantum_bench.scheduling.CostModel), in addition to the output file when resuming.
+                       With several workers, the runs are executed longest first, so no large compile is left
+                       running alone at the end. The rows are still written in the order of a serial run.
+                       Not applied with job budgets, which rely on ascending qubit counts.
+        dry_run: Only prints the estimated schedule and predicted runtime without executing anything.
+        save_checkpoints: Whether the adapters save the circuit state after the rebase and layout selection
+                          (see quantum_bench.compilers.base.CompilerAdapter.run_steps).
+        resume_from: Starts every compile from a checkpoint ('rebase' or 'layout'), so only the later phases
+                     are executed and timed. Missing checkpoints are computed once without being timed.
+                     Only Cirq has a 'layout' checkpoint, the preset Qiskit pipeline (active_phases=None) none.
     """
     print(f"Starting Benchmarking Suite ({num_runs} runs per config)...")
 
-    if os.path.exists(output_file):
-        os.remove(output_file)
+    if compilers is None:
+        compilers = available_compilers()
+    if repetition:
+        num_runs = 1
+    if shard:
+        shard_index, shard_count = parse_shard(shard)
+        base_output_file = output_file
+        output_file = shard_output_file(output_file, shard_index, shard_count)
 
+    completed = set()
+    recorded_runs = {}
+    if resume and repetition:
+        # Adaptive configurations are resumed as a whole: summarized ones are skipped (their run 0 key counts
+        # as completed), the others continue from their recorded runs.
+        completed = load_summarized_configurations(stats_file_path(output_file))
+        recorded_runs = load_recorded_runs(output_file)
+        print(f"Resuming: {len(completed)} configurations already measured in {stats_file_path(output_file)}.")
+    elif resume:
+        completed = load_completed_keys(output_file)
+        print(f"Resuming: {len(completed)} runs already recorded in {output_file}.")
+    elif not dry_run:
+        remove_results(output_file)
+        remove_results(stats_file_path(output_file))
+        remove_results(summary_file_path(output_file))
+
+    hardware_models = {}
+    cases = []
     for hardware_name in hardware_names:
         hardware = mqt.get_hardware_model(hardware_name)
         if not hardware:
@@ -45,102 +113,175 @@ def run_benchmark(hardware_names: List[str], algo_names: List[str], qubit_ranges
             continue
 
         print(f"\n=== Hardware: {hardware_name} ===")
-        compilers = [CirqAdapter(hardware), PytketAdapter(hardware), QiskitAdapter(hardware)]
+        if num_workers != 1:
+            hardware.share_topology(os.path.join("benchmarks_cache", hardware_name, "topology", hardware.fingerprint()[:16]))
+        hardware_models[hardware_name] = hardware
 
         for benchmark_level in benchmark_levels:
             for n_qubits in qubit_ranges:
                 if n_qubits > hardware.num_qubits:
                     continue
+                cases.extend((hardware_name, benchmark_level, n_qubits, algo_name) for algo_name in algo_names)
+
+    if shard:
+        write_manifest(manifest_file_path(base_output_file), cases, compilers, opt_levels, num_runs, shard_count)
+        cases = select_shard(cases, shard_index, shard_count)
+        print(f"\nShard {shard}: {len(cases)} benchmark cases, results in {output_file}.")
 
-                for algo_name in algo_names:
-                    _run_single_benchmark_case(
-                        hardware, compilers, benchmark_level, n_qubits, algo_name,
-                        opt_levels, num_runs, run_verification, run_visualisation,
-                        output_file, visualisation_path, seed, active_phases, qubit_ranges
-                    )
+    jobs = []
+    for hardware_name, benchmark_level, n_qubits, algo_name in cases:
+        jobs.extend(_prepare_benchmark_case(
+            hardware_models[hardware_name], benchmark_level, n_qubits, algo_name,
+            opt_levels, num_runs, run_verification, run_visualisation,
+            visualisation_path, seed, active_phases, qubit_ranges, completed, metric_source, compilers,
+            save_checkpoints, resume_from
+        ))
+
+    # Execution order of the jobs as indices into jobs, None if they are executed in order.
+    order = None
+    workers = num_workers or os.cpu_count() or 1
+    if dry_run or (workers > 1 and job_timeout is None and memory_limit_mb is None and not repetition):
+        model = CostModel.from_files((history_files or []) + [output_file])
+        if dry_run:
+            print_schedule(jobs, model, workers)
+            return
+        order, _, makespan = schedule_jobs(jobs, model, workers)
+        print(f"\nScheduled {len(jobs)} compiler runs longest first, predicted runtime {makespan:.1f} s.")
+
+    summaries = []
+    if repetition:
+        print(f"\nMeasuring {len(jobs)} configurations adaptively...")
+        results = iter_adaptive_results(jobs, hardware_models, repetition, summaries, recorded_runs)
+    else:
+        if jobs:
+            print(f"\nExecuting {len(jobs)} compiler runs with {num_workers or os.cpu_count()} worker(s)...")
+        results = iter_results([jobs[i] for i in order] if order else jobs, hardware_models, num_workers,
+                               job_timeout, memory_limit_mb)
+
+    with open_result_writer(output_file) as writer, \
+            IsolatedPool(verification_workers, preload=["quantum_bench.data.mqt_provider"]) as verifier:
+        ordered_writer = _OrderedRowWriter(writer)
+        # Rows waiting for their verification result, keyed by job index.
+        pending_rows: Dict[int, Tuple[Dict[str, Any], str]] = {}
+        for position, row in enumerate(results):
+            # Rows are written in the original job order, also when the jobs are executed longest first.
+            index = order[position] if order else position
+            verification = row.pop(VERIFICATION_FIELD, None)
+            if verification:
+                pending_rows[index] = (row, verification[1])
+                verifier.submit(index, mqt.verify_circuit, *verification, timeout=verification_timeout)
+            else:
+                ordered_writer.write(index, row)
+            _record_verifications(verifier.results(), pending_rows, ordered_writer)
+
+        if pending_rows:
+            print(f"\nWaiting for {len(pending_rows)} pending verification(s)...")
+        _record_verifications(verifier.wait_all(), pending_rows, ordered_writer)
+
+    write_summaries(summaries, stats_file_path(output_file))
 
     if os.path.exists(output_file):
         print(f"Benchmark finished. Results saved to {output_file}.")
+        load_summary(output_file)
+        print(f"Summary saved to {summary_file_path(output_file)}.")
         if run_plotter:
+            from quantum_bench.plotter import plot_results
             plot_results(output_file, visualisation_path)
     else:
         print("Benchmark failed.")
 
 
-def _run_single_benchmark_case(hardware, compilers, benchmark_level, n_qubits, algo_name,
-                               opt_levels, num_runs, run_verification, run_visualisation,
-                               output_file, visualisation_path, seed, active_phases, qubit_ranges):
-    
+class _OrderedRowWriter:
+    """
+    Writes result rows in job index order.
+
+    A row finishing before a row with a lower index (e.g. while that one is still being verified) is held back
+    until all rows before it are written, so the output file keeps the order of a serial run.
+    """
+
+    def __init__(self, writer: ResultWriter):
+        self.writer = writer
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._next_index = 0
+
+    def write(self, index: int, row: Dict[str, Any]):
+        """Adds the row of a job and writes all rows that no longer wait for an earlier one."""
+        self._rows[index] = row
+        while self._next_index in self._rows:
+            row = self._rows.pop(self._next_index)
+            print(row)
+            self.writer.write(row)
+            self._next_index += 1
+
+
+def _record_verifications(results: Iterable[IsolatedResult], pending_rows: Dict[int, Tuple[Dict[str, Any], str]],
+                          writer: _OrderedRowWriter):
+    """Merges finished verifications into their pending rows and writes the rows."""
+    for result in results:
+        row, staged_qasm_path = pending_rows.pop(result.key)
+        if result.status == "ok":
+            row["Equivalence"] = result.value
+        elif result.status == "timeout":
+            row["Equivalence"] = "Timeout"
+        else:
+            print(f"Error during verification: {result.value}")
+            row["Equivalence"] = "Error"
+        if os.path.exists(staged_qasm_path):
+            os.remove(staged_qasm_path)
+        writer.write(result.key, row)
+
+
+def _prepare_benchmark_case(hardware, benchmark_level, n_qubits, algo_name,
+                            opt_levels, num_runs, run_verification, run_visualisation,
+                            visualisation_path, seed, active_phases, qubit_ranges, completed,
+                            metric_source, compilers, save_checkpoints, resume_from) -> List[BenchmarkJob]:
+
+    pending = [
+        (compiler_name, opt_level, run_i)
+        for compiler_name in compilers
+        for opt_level in opt_levels
+        for run_i in range(num_runs)
+        if make_key(hardware.name, benchmark_level, algo_name, n_qubits, compiler_name, opt_level, run_i) not in completed
+    ]
+    if not pending:
+        return []
+
     qasm_path = mqt.get_circuit(hardware.name, algo_name, n_qubits, benchmark_level)
     if not qasm_path:
-        return
+        return []
 
     if run_visualisation and n_qubits == min(qubit_ranges):
         mqt.visualize_circuit(qasm_path, hardware.name, visualisation_path)
 
     print(f"--- {benchmark_level}-Benchmark: {algo_name} ({n_qubits} Qubits) ---")
 
-    for compiler in compilers:
-        for opt_level in opt_levels:
-            for run_i in range(num_runs):
-                _execute_and_record_run(
-                    hardware, benchmark_level, algo_name, n_qubits, compiler, opt_level, run_i,
-                    qasm_path, active_phases, seed, run_verification, run_visualisation,
-                    output_file, visualisation_path, qubit_ranges
-                )
-
-
-def _execute_and_record_run(hardware, benchmark_level, algo_name, n_qubits, compiler, opt_level, run_i,
-                            qasm_path, active_phases, seed, run_verification, run_visualisation,
-                            output_file, visualisation_path, qubit_ranges):
-    
-    row = {
-        "hardware": hardware.name,
-        "benchmark_level": benchmark_level,
-        "algorithm": algo_name,
-        "qubits": n_qubits,
-        "compiler": compiler.name,
-        "opt_level": opt_level,
-        "run": run_i,
-    }
-
-    try:
-        metrics, compiled_qasm_path = compiler.compile(
-            qasm_file=qasm_path,
-            optimization_level=opt_level,
+    return [
+        BenchmarkJob(
+            hardware=hardware.name,
+            benchmark_level=benchmark_level,
+            algorithm=algo_name,
+            qubits=n_qubits,
+            compiler=compiler_name,
+            opt_level=opt_level,
+            run=run_i,
+            qasm_path=qasm_path,
             active_phases=active_phases,
-            seed=seed
+            seed=seed,
+            run_verification=run_verification,
+            run_visualisation=run_visualisation,
+            is_reference=n_qubits == min(qubit_ranges) and run_i == 0,
+            visualisation_path=visualisation_path,
+            metric_source=metric_source,
+            save_checkpoints=save_checkpoints,
+            resume_from=resume_from,
         )
-
-        if metrics:
-            row.update(metrics)
-            row["success"] = True
-        else:
-            row.update({k: '-' for k in ["gate_count", "depth", "compile_time", "2q_gates", "swap_gates", "initial"]})
-            row["success"] = False
-
-        if run_visualisation and compiled_qasm_path and n_qubits == min(qubit_ranges) and run_i == 0:
-            mqt.visualize_circuit(compiled_qasm_path, hardware.name, visualisation_path)
-
-        if run_verification:
-            if compiled_qasm_path and n_qubits == min(qubit_ranges) and run_i == 0:
-                row["Equivalence"] = mqt.verify_circuit(qasm_path, compiled_qasm_path)
-            else:
-                row["Equivalence"] = "Skipped"
-                
-    except Exception as e:
-        row["success"] = False
-        print(f"Error during compilation: {e}")
-
-    print(row)
-    
-    df_row = pd.DataFrame([row])
-    write_header = not os.path.exists(output_file)
-    df_row.to_csv(output_file, mode='a', header=write_header, index=False)
+        for compiler_name, opt_level, run_i in pending
+    ]
 
 
 def run_mapping_benchmark(hardware_names: List[str], algo_names: List[str], qubit_ranges: List[int],
-                          output_file: str = "results_mapping.csv", plot_path: str = "plots_mapping", run_plotter: bool = False):
+                          output_file: str = "results_mapping.csv", plot_path: str = "plots_mapping", run_plotter: bool = False,
+                          num_workers: Optional[int] = 1, resume: bool = False):
     run_benchmark(
         hardware_names=hardware_names,
         algo_names=algo_names,
@@ -149,14 +290,20 @@ def run_mapping_benchmark(hardware_names: List[str], algo_names: List[str], qubi
         opt_levels=[3],
         num_runs=1,
         output_file=output_file,
-        active_phases=["rebase", "mapping"]
+        active_phases=["rebase", "mapping"],
+        num_workers=num_workers,
+        resume=resume,
+        # The rebase is computed once per circuit and reused, so only the mapping is timed.
+        resume_from="rebase"
     )
     if run_plotter:
+        from quantum_bench.plotter import plot_mapping_benchmark
         plot_mapping_benchmark(output_file, plot_path)
 
 
 def run_compilation_benchmark(hardware_names: List[str], algo_names: List[str], qubit_ranges: List[int],
-                              output_file: str = "results_compilation.csv", plot_path: str = "plots_compilation", run_plotter: bool = False):
+                              output_file: str = "results_compilation.csv", plot_path: str = "plots_compilation", run_plotter: bool = False,
+                              num_workers: Optional[int] = 1, resume: bool = False):
     run_benchmark(
         hardware_names=hardware_names,
         algo_names=algo_names,
@@ -165,6 +312,9 @@ def run_compilation_benchmark(hardware_names: List[str], algo_names: List[str],
         opt_levels=[3],
         num_runs=1,
         output_file=output_file,
+        num_workers=num_workers,
+        resume=resume
     )
     if run_plotter:
+        from quantum_bench.plotter import plot_compilation_benchmark
         plot_compilation_benchmark(output_file, plot_path)
@@ -0,0 +1,224 @@
+import math
+import os
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Tuple
+
+import numpy as np
+import pandas as pd
+
+import quantum_bench.data.mqt_provider as mqt
+from quantum_bench.compilers.registry import available_compilers
+from quantum_bench.executor import BenchmarkJob, iter_results
+from quantum_bench.results import open_result_writer, remove_results
+
+# Number of most recent points the prediction of the next compile time is fitted to. Small circuits are dominated
+# by constant overhead, so a fit over all points underestimates the growth at the end of the sweep.
+PREDICTION_WINDOW = 3
+
+
+def fit_power_law(x: np.ndarray, y: np.ndarray) -> Optional[Tuple[float, float, float]]:
+    """
+    Fits y = coefficient * x^exponent by least squares in log-log space.
+
+    Args:
+        x: Positive sizes.
+        y: Observed values. Non-positive values are ignored.
+
+    Returns:
+        Tuple of (coefficient, exponent, R^2 in log space), or None if fewer than two distinct sizes remain.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    valid = (x > 0) & (y > 0)
+    x, y = np.log(x[valid]), np.log(y[valid])
+    if len(np.unique(x)) < 2:
+        return None
+
+    exponent, intercept = np.polyfit(x, y, 1)
+    residual = y - (intercept + exponent * x)
+    total = ((y - y.mean()) ** 2).sum()
+    r2 = 1 - (residual ** 2).sum() / total if total > 0 else 1.0
+    return float(np.exp(intercept)), float(exponent), float(r2)
+
+
+def next_qubit_count(qubits: int, growth: float) -> int:
+    """Returns the next qubit count of a geometric sweep, at least one more than the current one."""
+    return max(qubits + 1, math.ceil(qubits * growth))
+
+
+def exponents_file_path(output_file: str) -> str:
+    """Returns the path of the fitted exponents table belonging to a scaling result file."""
+    return f"{os.path.splitext(output_file.rstrip(os.sep))[0]}_exponents.csv"
+
+
+@dataclass
+class ScalingSeries:
+    """The growing sequence of qubit counts of one (hardware, algorithm, compiler, optimization level)."""
+    hardware: str
+    benchmark_level: str
+    algorithm: str
+    compiler: str
+    opt_level: int
+    qubits: int
+    max_qubits: int
+    # Median compile time and compiled gate count per measured qubit count.
+    points: Dict[int, Tuple[float, float]] = field(default_factory=dict)
+    stop_reason: Optional[str] = None
+    # Qubit count and predicted compile time of the point skipped by a predictive stop.
+    skipped_qubits: Optional[int] = None
+    predicted_time: Optional[float] = None
+
+    def record(self, rows: List[Dict[str, Any]]):
+        """Adds the rows measured at the current qubit count."""
+        if not rows:
+            self.stop_reason = "skipped"
+            return
+        ok = [row for row in rows if row.get("success")]
+        failed = [row for row in rows if not row.get("success")]
+        if failed:
+            # 'error', 'timeout' or 'oom'
+            self.stop_reason = failed[0].get("status") or "error"
+            if not ok:
+                return
+        self.points[self.qubits] = (
+            float(np.median([row["compile_time"] for row in ok])),
+            float(np.median([row["gate_count"] for row in ok])),
+        )
+
+    def advance(self, growth: float, time_budget: float):
+        """Moves to the next qubit count, or stops the series at max_qubits or if it would exceed the time budget."""
+        if self.stop_reason:
+            return
+        if self.points and self.points[max(self.points)][0] > time_budget:
+            self.stop_reason = "budget"
+            return
+
+        if self.qubits >= self.max_qubits:
+            self.stop_reason = "max_qubits"
+            return
+        # The last step is shortened, so the largest allowed size is always measured.
+        next_qubits = min(next_qubit_count(self.qubits, growth), self.max_qubits)
+
+        recent = sorted(self.points)[-PREDICTION_WINDOW:]
+        fit = fit_power_law(np.array(recent), np.array([self.points[n][0] for n in recent]))
+        if fit is not None:
+            coefficient, exponent, _ = fit
+            predicted_time = coefficient * next_qubits ** exponent
+            if predicted_time > time_budget:
+                self.stop_reason = "predicted"
+                self.skipped_qubits, self.predicted_time = next_qubits, predicted_time
+                return
+        self.qubits = next_qubits
+
+    def exponents(self) -> Dict[str, Any]:
+        """Returns the power-law fits of compile time and gate count over all measured points."""
+        sizes = np.array(sorted(self.points))
+        row = {
+            "hardware": self.hardware, "benchmark_level": self.benchmark_level, "algorithm": self.algorithm,
+            "compiler": self.compiler, "opt_level": self.opt_level,
+            "points": len(sizes), "max_measured_qubits": int(sizes.max()) if len(sizes) else None,
+        }
+        for name, column in (("time", 0), ("gate", 1)):
+            fit = fit_power_law(sizes, np.array([self.points[n][column] for n in sizes]))
+            row[f"{name}_coefficient"], row[f"{name}_exponent"], row[f"{name}_r2"] = fit or (None, None, None)
+        row["stop_reason"] = self.stop_reason
+        row["skipped_qubits"] = self.skipped_qubits
+        row["predicted_time"] = self.predicted_time
+        return row
+
+
+def run_scaling_benchmark(hardware_names: List[str], algo_names: List[str], benchmark_level: str = "INDEP",
+                          opt_levels: Optional[List[int]] = None, compilers: Optional[List[str]] = None,
+                          start_qubits: int = 4, growth: float = 1.5, max_qubits: Optional[int] = None,
+                          time_budget: float = 600, num_runs: int = 1, seed: Optional[int] = None,
+                          active_phases: Optional[List[str]] = None, num_workers: Optional[int] = 1,
+                          job_timeout: Optional[float] = None,
+                          output_file: str = "scaling_results.csv") -> pd.DataFrame:
+    """
+    Grows the qubit count of every (hardware, algorithm, compiler, optimization level) geometrically until its
+    compile time exceeds the budget.
+
+    After every measured size, a power law is fitted to the compile times of the last PREDICTION_WINDOW sizes.
+    A series stops before a size whose predicted compile time exceeds the budget, so the expensive point is never
+    executed. It also stops once a measured compile time exceeds the budget, a run fails or times out, or the
+    hardware has too few qubits. All series advance in rounds, and the runs of a round are executed in parallel.
+
+    Args:
+        hardware_names: List of hardware names to benchmark against.
+        algo_names: List of algorithm names to benchmark.
+        benchmark_level: Benchmark level of the input circuits.
+        opt_levels: Optimization levels to test. Defaults to [3].
+        compilers: Names of the compilers to benchmark. Defaults to all registered compilers.
+        start_qubits: Qubit count of the first point.
+        growth: Factor between consecutive qubit counts.
+        max_qubits: Largest qubit count. Defaults to the size of the hardware.
+        time_budget: Compile time in seconds no point may be predicted to exceed.
+        num_runs: Number of runs per point, the median compile time is used for the fits.
+        seed: Random seed.
+        active_phases: List of active compiler phases.
+        num_workers: Number of worker processes, None uses all available cores.
+        job_timeout: Wall-clock budget in seconds per compiler run (see run_benchmark). Guards against
+                     compile times far above the prediction.
+        output_file: Path to the result file. The fitted exponents are written to '<output>_exponents.csv'.
+
+    Returns:
+        The table of fitted exponents, one row per series.
+    """
+    opt_levels = opt_levels or [3]
+    compilers = compilers or available_compilers()
+    remove_results(output_file)
+
+    hardware_models = {}
+    series = []
+    for hardware_name in hardware_names:
+        hardware = mqt.get_hardware_model(hardware_name)
+        if not hardware:
+            print(f"Skipping unknown hardware: {hardware_name}")
+            continue
+        hardware_models[hardware_name] = hardware
+        limit = min(hardware.num_qubits, max_qubits or hardware.num_qubits)
+        series.extend(
+            ScalingSeries(hardware_name, benchmark_level, algo_name, compiler_name, opt_level, start_qubits, limit)
+            for algo_name in algo_names for compiler_name in compilers for opt_level in opt_levels
+            if start_qubits <= limit
+        )
+
+    with open_result_writer(output_file) as writer:
+        active = list(series)
+        while active:
+            jobs = []
+            for s in active:
+                qasm_path = mqt.get_circuit(s.hardware, s.algorithm, s.qubits, s.benchmark_level)
+                if not qasm_path:
+                    s.stop_reason = "no_circuit"
+                    continue
+                jobs.extend(
+                    BenchmarkJob(hardware=s.hardware, benchmark_level=s.benchmark_level, algorithm=s.algorithm,
+                                 qubits=s.qubits, compiler=s.compiler, opt_level=s.opt_level, run=run_i,
+                                 qasm_path=qasm_path, active_phases=active_phases, seed=seed)
+                    for run_i in range(num_runs)
+                )
+
+            print(f"\nScaling round: {len(jobs)} compiler runs at "
+                  f"{sorted({job.qubits for job in jobs})} qubits ({len(active)} active series)...")
+            rows: Dict[tuple, List[Dict[str, Any]]] = {}
+            for row in iter_results(jobs, hardware_models, num_workers, job_timeout):
+                print(row)
+                writer.write(row)
+                rows.setdefault((row["hardware"], row["algorithm"], row["compiler"], row["opt_level"]), []).append(row)
+
+            for s in active:
+                if s.stop_reason:
+                    continue
+                s.record(rows.get((s.hardware, s.algorithm, s.compiler, s.opt_level), []))
+                s.advance(growth, time_budget)
+            active = [s for s in active if not s.stop_reason]
+
+    exponents = pd.DataFrame([s.exponents() for s in series])
+    exponents_file = exponents_file_path(output_file)
+    exponents.to_csv(exponents_file, index=False)
+    print(f"Scaling benchmark finished. Results saved to {output_file}, fitted exponents to {exponents_file}.")
+    if not exponents.empty:
+        print(exponents[["hardware", "algorithm", "compiler", "opt_level", "max_measured_qubits",
+                         "time_exponent", "gate_exponent", "stop_reason"]].to_string(index=False))
+    return exponents
@@ -0,0 +1,137 @@
+import heapq
+import os
+from typing import List, Optional, Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from quantum_bench.aggregate import DIMENSIONS
+from quantum_bench.executor import BenchmarkJob, input_metrics
+from quantum_bench.results import read_results
+
+# Result columns used to estimate compile times.
+HISTORY_COLUMNS = DIMENSIONS + ["compile_time", "initial_gate_count"]
+
+# Seconds per (qubit * input gate) assumed when there is no history at all.
+_DEFAULT_COST_FACTOR = 1e-4
+
+
+class CostModel:
+    """
+    Estimates the compile time of benchmark jobs from earlier results.
+
+    A configuration recorded before is estimated by the median of its compile times. All others are estimated by
+    a power law time = a * qubits^b * gates^c, fitted per compiler (or over all compilers if a compiler has too few
+    results) by least squares in log space. Without any history, the cost is proportional to qubits * gates.
+    """
+
+    def __init__(self, history: Optional[pd.DataFrame] = None):
+        """
+        Initializes the model.
+
+        Args:
+            history: Earlier result rows with at least the HISTORY_COLUMNS.
+        """
+        self._medians: Dict[Tuple, float] = {}
+        self._fits: Dict[Optional[str], np.ndarray] = {}
+        if history is None or history.empty:
+            return
+
+        history = history.dropna(subset=["compile_time"])
+        history = history[history["compile_time"] > 0]
+        medians = history.groupby(DIMENSIONS, observed=True)["compile_time"].median()
+        self._medians = {tuple(str(v) for v in key): value for key, value in medians.items()}
+
+        fit_data = history.dropna(subset=["initial_gate_count"])
+        for compiler, rows in fit_data.groupby("compiler", observed=True):
+            self._fit(str(compiler), rows)
+        self._fit(None, fit_data)
+
+    @classmethod
+    def from_files(cls, paths: List[str]) -> "CostModel":
+        """Builds the model from all existing result files among the paths (CSV or Parquet)."""
+        frames = []
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            try:
+                frames.append(read_results(path, columns=HISTORY_COLUMNS, filters=[("success", "==", True)]))
+            except Exception as e:
+                print(f"Could not read history from {path}: {e}")
+        if not frames:
+            return cls()
+        return cls(pd.concat(frames, ignore_index=True))
+
+    def estimate(self, job: BenchmarkJob) -> Tuple[float, str]:
+        """
+        Estimates the compile time of a job.
+
+        Args:
+            job: The job.
+
+        Returns:
+            Tuple of (estimated seconds, source of the estimate: 'history', 'model' or 'default').
+        """
+        key = tuple(str(v) for v in (job.hardware, job.benchmark_level, job.algorithm, job.qubits,
+                                     job.compiler, job.opt_level))
+        if key in self._medians:
+            return self._medians[key], "history"
+
+        gates = input_metrics(job.qasm_path)["gate_count"]
+        coefficients = self._fits.get(job.compiler, self._fits.get(None))
+        if coefficients is not None:
+            features = np.array([1.0, np.log(job.qubits), np.log(gates + 1)])
+            return float(np.exp(features @ coefficients)), "model"
+        return _DEFAULT_COST_FACTOR * job.qubits * gates, "default"
+
+    def _fit(self, compiler: Optional[str], rows: pd.DataFrame):
+        # Three coefficients need at least three distinct circuits.
+        if rows[["qubits", "initial_gate_count"]].drop_duplicates().shape[0] < 3:
+            return
+        features = np.column_stack([
+            np.ones(len(rows)),
+            np.log(rows["qubits"].to_numpy(dtype=float)),
+            np.log(rows["initial_gate_count"].to_numpy(dtype=float) + 1),
+        ])
+        target = np.log(rows["compile_time"].to_numpy(dtype=float))
+        self._fits[compiler], *_ = np.linalg.lstsq(features, target, rcond=None)
+
+
+def schedule_jobs(jobs: List[BenchmarkJob], model: CostModel,
+                  num_workers: int) -> Tuple[List[int], List[float], float]:
+    """
+    Orders the jobs longest first (LPT) and predicts the makespan on the given number of workers.
+
+    Jobs with the same estimate keep their relative order, so the runs of a configuration stay adjacent
+    and are still executed in one batch.
+
+    Args:
+        jobs: The jobs to schedule.
+        model: The cost model.
+        num_workers: Number of parallel workers.
+
+    Returns:
+        Tuple of (indices of the jobs in execution order, their estimated seconds, predicted makespan in seconds).
+    """
+    estimates = [model.estimate(job)[0] for job in jobs]
+    order = sorted(range(len(jobs)), key=lambda i: -estimates[i])
+
+    finish_times = [0.0] * max(1, num_workers)
+    for i in order:
+        heapq.heapreplace(finish_times, finish_times[0] + estimates[i])
+
+    return order, [estimates[i] for i in order], max(finish_times)
+
+
+def print_schedule(jobs: List[BenchmarkJob], model: CostModel, num_workers: int, top: int = 10):
+    """Prints the estimated cost of the jobs, the longest jobs and the predicted makespan."""
+    estimates = [model.estimate(job) for job in jobs]
+    sources = pd.Series([source for _, source in estimates]).value_counts().to_dict()
+    order, seconds, makespan = schedule_jobs(jobs, model, num_workers)
+
+    print(f"\nSchedule of {len(jobs)} compiler runs on {num_workers} worker(s) (estimates: {sources}):")
+    print(f"  Total compile time: {sum(seconds):.1f} s, predicted makespan: {makespan:.1f} s")
+    for index, estimate in list(zip(order, seconds))[:top]:
+        job = jobs[index]
+        print(f"  {estimate:10.2f} s  {job.compiler} {job.hardware} {job.benchmark_level} {job.algorithm} "
+              f"({job.qubits} Qubits) opt{job.opt_level} run {job.run}")
@@ -0,0 +1,163 @@
+import argparse
+import json
+import os
+from collections import Counter
+from typing import List, Tuple, Dict, Any, Set
+
+import pandas as pd
+
+from quantum_bench.aggregate import load_summary
+from quantum_bench.results import (KEY_COLUMNS, PARQUET_SUFFIX, ResultKey, make_key, open_result_writer,
+                                   read_results, remove_results)
+
+# A benchmark circuit: (hardware, benchmark level, qubits, algorithm). Shards are formed from whole cases,
+# so every shard generates and parses only the circuits of its own jobs.
+BenchmarkCase = Tuple[str, str, int, str]
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """
+    Parses a shard specification.
+
+    Args:
+        shard: Shard as 'i/N' with 0 <= i < N, e.g. '0/4' for the first of four shards.
+
+    Returns:
+        Tuple of (index, count).
+    """
+    try:
+        index, count = (int(part) for part in shard.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard '{shard}', expected 'i/N'.")
+    if not 0 <= index < count:
+        raise ValueError(f"Invalid shard '{shard}', the index must be between 0 and {count - 1}.")
+    return index, count
+
+
+def select_shard(cases: List[BenchmarkCase], index: int, count: int) -> List[BenchmarkCase]:
+    """Returns the cases of a shard. Cases are dealt out round-robin, so every shard gets small and large circuits."""
+    return cases[index::count]
+
+
+def shard_output_file(output_file: str, index: int, count: int) -> str:
+    """Returns the result file of a shard, e.g. 'results.shard-0-of-4.csv' for 'results.csv'."""
+    stem, extension = os.path.splitext(output_file.rstrip(os.sep))
+    return f"{stem}.shard-{index}-of-{count}{extension}"
+
+
+def manifest_file_path(output_file: str) -> str:
+    """Returns the path of the job manifest belonging to a (merged) result file."""
+    return f"{os.path.splitext(output_file.rstrip(os.sep))[0]}.manifest.json"
+
+
+def write_manifest(manifest_file: str, cases: List[BenchmarkCase], compilers: List[str], opt_levels: List[int],
+                   num_runs: int, num_shards: int):
+    """
+    Writes the job manifest of a sharded benchmark.
+
+    The manifest only depends on the benchmark arguments, so all shards write identical files. A differing
+    existing manifest means the shards were started with different arguments, which is rejected.
+
+    Args:
+        manifest_file: Path of the manifest.
+        cases: All benchmark cases of the sweep in job order.
+        compilers: Names of the benchmarked compilers.
+        opt_levels: Benchmarked optimization levels.
+        num_runs: Number of runs per configuration.
+        num_shards: Number of shards the cases are split into.
+    """
+    manifest = {
+        "cases": [list(case) for case in cases],
+        "compilers": list(compilers),
+        "opt_levels": list(opt_levels),
+        "num_runs": num_runs,
+        "num_shards": num_shards,
+    }
+    if os.path.exists(manifest_file):
+        if load_manifest(manifest_file) != manifest:
+            raise ValueError(f"{manifest_file} was written for different benchmark arguments.")
+        return
+
+    tmp_file = f"{manifest_file}.{os.getpid()}.tmp"
+    with open(tmp_file, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_file, manifest_file)
+
+
+def load_manifest(manifest_file: str) -> Dict[str, Any]:
+    with open(manifest_file, "r") as f:
+        return json.load(f)
+
+
+def manifest_keys(manifest: Dict[str, Any]) -> Set[ResultKey]:
+    """Returns the keys of all compiler runs listed in a manifest."""
+    return {
+        make_key(hardware, benchmark_level, algorithm, qubits, compiler, opt_level, run)
+        for hardware, benchmark_level, qubits, algorithm in manifest["cases"]
+        for compiler in manifest["compilers"]
+        for opt_level in manifest["opt_levels"]
+        for run in range(manifest["num_runs"])
+    }
+
+
+def merge_shards(output_file: str) -> bool:
+    """
+    Combines the shard result files of a sharded benchmark into one result file.
+
+    Verifies the merged results against the manifest: runs of the manifest without a result are reported as missing,
+    runs recorded more than once as duplicated (only their first row is kept).
+
+    Args:
+        output_file: The output_file passed to the shards. The merged results are written to it.
+
+    Returns:
+        True if every run of the manifest was recorded exactly once.
+    """
+    manifest_file = manifest_file_path(output_file)
+    if not os.path.exists(manifest_file):
+        print(f"Manifest {manifest_file} not found.")
+        return False
+    manifest = load_manifest(manifest_file)
+    count = manifest["num_shards"]
+
+    frames = []
+    for index in range(count):
+        shard_file = shard_output_file(output_file, index, count)
+        if not os.path.exists(shard_file):
+            print(f"Shard {index}/{count} has no results ({shard_file} not found).")
+            continue
+        frames.append(read_results(shard_file))
+    if not frames:
+        return False
+    df = pd.concat(frames, ignore_index=True)
+
+    keys = [make_key(*values) for values in df[KEY_COLUMNS].itertuples(index=False, name=None)]
+    counts = Counter(keys)
+    duplicated = {key for key, n in counts.items() if n > 1}
+    missing = manifest_keys(manifest) - set(counts)
+
+    df = df[~pd.Series(keys).duplicated().to_numpy()]
+    remove_results(output_file)
+    with open_result_writer(output_file, buffer_size=len(df) or 1) as writer:
+        for row in df.astype(object).where(df.notna(), None).to_dict("records"):
+            writer.write(row)
+
+    print(f"Merged {len(df)} runs of {count} shards into {output_file}.")
+    load_summary(output_file)
+    for label, keys in (("Missing", missing), ("Duplicated", duplicated)):
+        if keys:
+            print(f"{label} runs ({len(keys)}):")
+            for key in sorted(keys):
+                print(f"  {key}")
+    return not missing and not duplicated
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merges the result files of a sharded benchmark.")
+    parser.add_argument("output_file", help=f"output_file passed to the shards (CSV or '{PARQUET_SUFFIX}' dataset)")
+    args = parser.parse_args()
+    raise SystemExit(0 if merge_shards(args.output_file) else 1)
+
+
+if __name__ == "__main__":
+    main()